@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Cold-start cost of ``import psprint``
+
+Every run is a fresh interpreter with ``HOME``, ``XDG_CONFIG_HOME`` and
+the working directory pointed at empty temporary directories, so that
+only the rc files of the scenario are found:
+
+    * ``none``: no rc files
+    * ``all``: rc files at every location ``init_print`` probes (the
+      ``root`` location ``/etc/psprint/style.yml`` only if it exists),
+      and a ``custom`` file passed to a second ``init_print`` call
+
+Usage::
+
+    python benchmarks/coldstart.py --runs 20 --output coldstart.json
+
+'''
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO = Path(__file__).resolve().parent.parent
+
+RC_TEXT = '''FLAGS:
+  pad: true
+bench:
+  pref: BENCH
+  pref_s: B
+  pref_color: yellow
+  text_gloss: dim
+'''
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import psprint
+if len(sys.argv) > 1:
+    psprint.init_print(sys.argv[1])
+sys.stdout.write(repr(time.perf_counter() - start))
+'''
+
+
+def _environment(home: Path, rc_files: bool) -> Dict[str, str]:
+    '''
+    Environment of a probe: isolated home, optionally with rc files
+    '''
+    env = dict(os.environ)
+    env['HOME'] = str(home)
+    env['XDG_CONFIG_HOME'] = str(home.joinpath('.config'))
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (str(REPO), env.get('PYTHONPATH'))))
+    env.pop('PYTHONSTARTUP', None)
+    if rc_files:
+        home.joinpath('.psprintrc').write_text(RC_TEXT)
+        config = home.joinpath('.config', 'psprint')
+        config.mkdir(parents=True, exist_ok=True)
+        config.joinpath('style.yml').write_text(RC_TEXT)
+        home.joinpath('cwd', '.psprintrc').write_text(RC_TEXT)
+    return env
+
+
+def _probe(env: Dict[str, str], cwd: Path, args: List[str],
+           importtime: bool = False) -> subprocess.CompletedProcess:
+    '''
+    Run one fresh interpreter importing psprint
+    '''
+    flags = ['-X', 'importtime'] if importtime else []
+    return subprocess.run([sys.executable, *flags, '-c', PROBE, *args],
+                          env=env,
+                          cwd=cwd,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          universal_newlines=True,
+                          check=True)
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    '''
+    min / median / max of ``samples`` [ms]
+    '''
+    return {
+        'min': round(min(samples) * 1000, 3),
+        'median': round(statistics.median(samples) * 1000, 3),
+        'max': round(max(samples) * 1000, 3),
+    }
+
+
+def parse_importtime(stderr: str, top: int = 15) -> List[Dict[str, object]]:
+    '''
+    Parse ``-X importtime`` output
+
+    Args:
+        stderr: stderr of an interpreter run with ``-X importtime``
+        top: number of modules kept, by cumulative time (psprint modules
+            and yaml are always kept)
+
+    Returns:
+        ``{'module', 'self_us', 'cumulative_us'}`` sorted by cumulative
+        time, slowest first
+
+    '''
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:  # header line
+            continue
+        entries.append({
+            'module': fields[2].strip(),
+            'self_us': self_us,
+            'cumulative_us': cumulative_us
+        })
+    entries.sort(key=lambda entry: entry['cumulative_us'], reverse=True)
+    return [
+        entry for rank, entry in enumerate(entries)
+        if rank < top or str(entry['module']).startswith(('psprint', 'yaml'))
+    ]
+
+
+def scenario(name: str, runs: int) -> Dict[str, object]:
+    '''
+    Benchmark one scenario
+
+    Args:
+        name: ``none`` or ``all``
+        runs: number of fresh interpreters timed
+
+    Returns:
+        wall and in-process import times [ms], ``-X importtime``
+        breakdown and rc files found
+
+    '''
+    with tempfile.TemporaryDirectory() as tmpdir:
+        home = Path(tmpdir)
+        cwd = home.joinpath('cwd')
+        cwd.mkdir()
+        rc_files = name == 'all'
+        env = _environment(home, rc_files)
+        args = []
+        if rc_files:
+            custom = home.joinpath('custom.yml')
+            custom.write_text(RC_TEXT)
+            args.append(str(custom))
+        _probe(env, cwd, args)  # warm file system caches
+        wall, inner = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            done = _probe(env, cwd, args)
+            wall.append(time.perf_counter() - start)
+            inner.append(float(done.stdout))
+        breakdown = parse_importtime(
+            _probe(env, cwd, args, importtime=True).stderr)
+        found = sorted(
+            str(path.relative_to(home)) for path in home.rglob('*')
+            if path.is_file())
+        if rc_files and Path('/etc/psprint/style.yml').is_file():
+            found.append('/etc/psprint/style.yml')
+    return {
+        'rc_files': found,
+        'wall_ms': _summary(wall),
+        'import_ms': _summary(inner),
+        'importtime': breakdown,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    '''
+    Benchmark all scenarios and write JSON
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs',
+                        type=int,
+                        default=10,
+                        help='fresh interpreters per scenario')
+    parser.add_argument('--scenario',
+                        action='append',
+                        choices=('none', 'all'),
+                        help='run only this scenario (repeatable)')
+    parser.add_argument('--output', help='write JSON here (default: stdout)')
+    args = parser.parse_args(argv)
+    results = {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        'scenarios': {
+            name: scenario(name, args.runs)
+            for name in (args.scenario or ('none', 'all'))
+        },
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Concurrency stress test of ``psprint``
+
+``--processes`` child interpreters, each running ``--threads`` threads,
+print ``--lines`` messages per thread to a shared stdout: a pipe, a file
+or ``/dev/null``. Every message carries a unique token, so the captured
+output (pipe, file) is checked for torn lines (not exactly one complete
+message) and missing messages. Throughput and per-call latency
+percentiles are reported as JSON.
+
+Usage::
+
+    python benchmarks/stress.py --target pipe --target file --processes 4
+
+'''
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO = Path(__file__).resolve().parent.parent
+STYLE = REPO.joinpath('psprint', 'style.yml')
+LINE = re.compile(r'^\[\w+\](\d+)-(\d+)-(\d+)\t(x*)$')
+
+
+def child(threads: int, lines: int, payload: int, worker: int,
+          latencies: str, flush: bool) -> None:
+    '''
+    Print from ``threads`` threads sharing one ``PrintSpace`` and stdout
+
+    Latencies [s] of every call are written to ``latencies`` as doubles.
+    '''
+    from psprint.printer import PrintSpace
+
+    space = PrintSpace(config=STYLE)
+    space.switches.update(bland=True, pad=False, short=False)
+    space.print_kwargs.update(file=sys.stdout, flush=flush)
+    text = 'x' * payload
+    samples = [array('d') for _ in range(threads)]
+    start = threading.Barrier(threads)
+
+    def run(thread: int) -> None:
+        clock = time.perf_counter
+        record = samples[thread].append
+        info = space.info
+        start.wait()
+        for seq in range(lines):
+            tick = clock()
+            info(f'{worker}-{thread}-{seq}', text)
+            record(clock() - tick)
+
+    pool = [
+        threading.Thread(target=run, args=(thread, ))
+        for thread in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    space.flush()
+    sys.stdout.flush()
+    with open(latencies, 'wb') as sink:
+        for sample in samples:
+            sample.tofile(sink)
+
+
+def check(output: Path, processes: int, threads: int, lines: int,
+          payload: int) -> Dict[str, int]:
+    '''
+    Count torn, duplicate and missing messages in captured ``output``
+    '''
+    seen = set()
+    torn = duplicate = 0
+    with open(output, 'r', errors='replace') as captured:
+        for line in captured:
+            match = LINE.match(line.rstrip('\n'))
+            if match is None or len(match.group(4)) != payload \
+               or not line.endswith('\n'):
+                torn += 1
+                continue
+            token = match.group(1, 2, 3)
+            if token in seen:
+                duplicate += 1
+            seen.add(token)
+    return {
+        'torn': torn,
+        'duplicate': duplicate,
+        'missing': processes * threads * lines - len(seen),
+    }
+
+
+def percentiles(samples: array) -> Dict[str, float]:
+    '''
+    Latency percentiles [us] (nearest rank)
+    '''
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    last = len(ordered) - 1
+    return {
+        name: round(ordered[min(last, int(rank * len(ordered)))] * 1e6, 3)
+        for name, rank in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99),
+                           ('p99.9', 0.999), ('max', 1))
+    }
+
+
+def _drain(source: int, sink: Path) -> None:
+    '''
+    Copy everything from pipe ``source`` to file ``sink``
+    '''
+    with open(source, 'rb') as pipe, open(sink, 'wb') as out:
+        for chunk in iter(lambda: pipe.read(1 << 16), b''):
+            out.write(chunk)
+
+
+def stress(target: str, processes: int, threads: int, lines: int,
+           payload: int, flush: bool) -> Dict[str, object]:
+    '''
+    Run one stress test
+
+    Args:
+        target: stdout shared by all children: ``pipe``, ``file`` or
+            ``devnull``
+        processes: child interpreters
+        threads: threads per child
+        lines: messages per thread
+        payload: characters of filler per message
+        flush: flush after every message
+
+    Returns:
+        throughput, latency percentiles and (except ``devnull``) counts
+        of torn, duplicate and missing messages
+
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (str(REPO), env.get('PYTHONPATH'))))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = Path(tmpdir).joinpath('output')
+        drain: Optional[threading.Thread] = None
+        if target == 'pipe':
+            read_fd, write_fd = os.pipe()
+            drain = threading.Thread(target=_drain, args=(read_fd, output))
+            drain.start()
+            stdout = write_fd
+        elif target == 'file':
+            stdout = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        else:
+            stdout = os.open(os.devnull, os.O_WRONLY)
+        workers = []
+        start = time.perf_counter()
+        for worker in range(processes):
+            latencies = str(Path(tmpdir).joinpath(f'latency-{worker}'))
+            command = [
+                sys.executable, __file__, '--child', '--threads',
+                str(threads), '--lines',
+                str(lines), '--payload',
+                str(payload), '--worker',
+                str(worker), '--latencies', latencies
+            ] + (['--flush'] if flush else [])
+            workers.append(
+                (subprocess.Popen(command, stdout=stdout, env=env),
+                 latencies))
+        os.close(stdout)
+        for proc, _ in workers:
+            proc.wait()
+        elapsed = time.perf_counter() - start
+        if drain is not None:
+            drain.join()
+        samples = array('d')
+        for proc, latencies in workers:
+            if proc.returncode:
+                raise RuntimeError(f'worker exited with {proc.returncode}')
+            with open(latencies, 'rb') as source:
+                samples.frombytes(source.read())
+        total = processes * threads * lines
+        result: Dict[str, object] = {
+            'target': target,
+            'processes': processes,
+            'threads': threads,
+            'lines': total,
+            'flush': flush,
+            'elapsed_s': round(elapsed, 3),
+            'lines_per_s': round(total / elapsed),
+            'latency_us': percentiles(samples),
+        }
+        if target != 'devnull':
+            result.update(check(output, processes, threads, lines, payload))
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    '''
+    Run stress tests and write JSON
+
+    Returns:
+        1 if any output was torn, duplicated or lost, else 0
+
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--target',
+                        action='append',
+                        choices=('pipe', 'file', 'devnull'),
+                        help='shared stdout (repeatable, default: all)')
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--threads',
+                        type=int,
+                        default=4,
+                        help='threads per process')
+    parser.add_argument('--lines',
+                        type=int,
+                        default=20000,
+                        help='messages per thread')
+    parser.add_argument('--payload',
+                        type=int,
+                        default=100,
+                        help='characters of filler per message')
+    parser.add_argument('--flush',
+                        action='store_true',
+                        help='flush after every message')
+    parser.add_argument('--output', help='write JSON here (default: stdout)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--worker',
+                        type=int,
+                        default=0,
+                        help=argparse.SUPPRESS)
+    parser.add_argument('--latencies', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(args.threads, args.lines, args.payload, args.worker,
+              args.latencies, args.flush)
+        return 0
+    results = [
+        stress(target, args.processes, args.threads, args.lines,
+               args.payload, args.flush)
+        for target in (args.target or ('pipe', 'file', 'devnull'))
+    ]
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
+    return int(
+        any(
+            result.get('torn') or result.get('duplicate')
+            or result.get('missing') for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -57,6 +57,12 @@ def init_print(custom: str = None) -> PrintSpace:
         if rc_locations[loc] is not None:
             if rc_locations[loc].is_file():  # type: ignore
                 default_print.set_opts(rc_locations[loc])
+    # files created later are picked up by ``reload``/``watch``
+    default_print.configs = [default_config] + [
+        rc_locations[loc]
+        for loc in ('root', 'user', 'config', 'local', 'custom')
+        if rc_locations[loc] is not None
+    ]
 
     if 'idlelib.run' in sys.modules or not sys.stdout.isatty():
         # Running inside idle
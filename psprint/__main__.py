@@ -21,9 +21,16 @@
 module init
 '''
 
-from . import print
+import argparse
+import sys
 
-if __name__ in ("__main__", "psprint.__main__"):
+from . import DEFAULT_PRINT, print
+
+
+def _usage() -> None:
+    '''
+    Demonstrate usage
+    '''
     print()
     print("usage:", mark='err', pad=True, short=False)
     print("Use me as an imported module", mark='info', pad=True, short=False)
@@ -34,5 +41,83 @@ if __name__ in ("__main__", "psprint.__main__"):
           pad=True,
           short=False)
     print("Or by editing its DEFAULT_PRINT instance", pad=True, short=False)
+    print("python -m psprint render RECORD", mark='act', pad=True, short=False)
+    print("python -m psprint view LOG --mark err",
+          mark='act',
+          pad=True,
+          short=False)
+    print("python -m psprint ring RING", mark='act', pad=True, short=False)
     print("Bye", mark='bug', pad=True, short=False)
     print()
+
+
+def _cli() -> argparse.ArgumentParser:
+    '''
+    Command line parser
+    '''
+    parser = argparse.ArgumentParser(prog='psprint',
+                                     description='Prompt String-like Print')
+    sub = parser.add_subparsers(dest='command')
+    render = sub.add_parser('render',
+                            help='render binary records as psprint text')
+    render.add_argument('record', help='file written by RecordSink')
+    view = sub.add_parser('view', help='filter a captured psprint text log')
+    view.add_argument('log', help='captured psprint output')
+    view.add_argument('--mark',
+                      action='append',
+                      help='show only lines with this mark (repeatable)')
+    view.add_argument('--from-line', type=int, default=1, help='first line')
+    view.add_argument('--to-line', type=int, default=None, help='last line')
+    view.add_argument('--reindex',
+                      action='store_true',
+                      help='rebuild the sidecar index')
+    view.add_argument('--raw',
+                      action='store_true',
+                      help='show lines as captured')
+    ring = sub.add_parser('ring', help='dump a ring buffer file in order')
+    ring.add_argument('ring', help='file written by RingSink')
+    for subparser in render, view:
+        for switch in DEFAULT_PRINT.switches:
+            if switch != 'disabled':
+                subparser.add_argument(f'--{switch}',
+                                       action='store_true',
+                                       default=None,
+                                       help=f'{switch} prefix')
+    return parser
+
+
+def main(argv=None) -> int:
+    '''
+    Command line entry point
+    '''
+    args = _cli().parse_args(argv)
+    if args.command is None:
+        _usage()
+        return 0
+    switches = {
+        key: value
+        for key, value in vars(args).items()
+        if key in DEFAULT_PRINT.switches and value is not None
+    }
+    if args.command == 'render':
+        from .record import render
+        render(args.record, DEFAULT_PRINT, **switches)
+    elif args.command == 'view':
+        from .viewer import view
+        view(args.log,
+             DEFAULT_PRINT,
+             marks=args.mark,
+             from_line=args.from_line,
+             to_line=args.to_line,
+             rebuild=args.reindex,
+             raw=args.raw,
+             **switches)
+    elif args.command == 'ring':
+        from .sinks import read_ring
+        sys.stdout.flush()
+        sys.stdout.buffer.write(read_ring(args.ring))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,8 +21,11 @@
 ANSI colors' and styles' definitions
 '''
 
+import os
 import types
+from functools import lru_cache
 from pathlib import Path
+from typing import Mapping, Tuple, Union
 
 import yaml
 
@@ -57,3 +60,144 @@ with open(Path(__file__).resolve().parent.joinpath("ansi.yml"), "r") as stream:
       * 3: bright
 
     '''
+
+
+BASIC_RGB: Tuple[Tuple[int, int, int], ...] = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+'''
+RGB of the 16 basic colors (xterm defaults), used for downgrades
+
+'''
+
+_CUBE = (0, 95, 135, 175, 215, 255)
+
+
+def color_depth(env: Mapping[str, str] = os.environ) -> int:
+    '''
+    Color depth supported by the terminal, from ``COLORTERM`` and ``TERM``
+
+    Args:
+        env: environment
+
+    Returns:
+        24 (truecolor), 8 (256 colors) or 4 (16 colors)
+
+    '''
+    if env.get('COLORTERM', '').lower() in ('truecolor', '24bit'):
+        return 24
+    if '256' in env.get('TERM', ''):
+        return 8
+    return 4
+
+
+DEPTH = color_depth()
+'''
+Color depth detected at import
+
+'''
+
+
+def _distance(one: Tuple[int, ...], other: Tuple[int, ...]) -> int:
+    return sum((a - b)**2 for a, b in zip(one, other))
+
+
+def palette_rgb(index: int) -> Tuple[int, int, int]:
+    '''
+    RGB of a 256-color palette ``index``
+    '''
+    if index < 16:
+        return BASIC_RGB[index]
+    if index < 232:
+        index -= 16
+        return (_CUBE[index // 36], _CUBE[index // 6 % 6], _CUBE[index % 6])
+    gray = 8 + 10 * (index - 232)
+    return (gray, gray, gray)
+
+
+@lru_cache(maxsize=None)
+def nearest_palette(rgb: Tuple[int, int, int]) -> int:
+    '''
+    Nearest 256-color palette index (color cube or gray ramp) of ``rgb``
+    '''
+    levels = [
+        min(range(6), key=lambda level: abs(_CUBE[level] - channel))
+        for channel in rgb
+    ]
+    cube = 16 + 36 * levels[0] + 6 * levels[1] + levels[2]
+    gray = 232 + min(23, max(0, (sum(rgb) // 3 - 3) // 10))
+    return min((cube, gray),
+               key=lambda index: _distance(palette_rgb(index), rgb))
+
+
+@lru_cache(maxsize=None)
+def nearest_basic(rgb: Tuple[int, int, int]) -> int:
+    '''
+    Nearest of the 16 basic colors of ``rgb``
+    '''
+    return min(range(16), key=lambda index: _distance(BASIC_RGB[index], rgb))
+
+
+def parse_color(color: Union[str, int]) -> Union[int, Tuple[int, int, int]]:
+    '''
+    Parse an extended color
+
+    Args:
+        color: ``#rrggbb`` or ``#rgb`` hex string, or 256-color palette
+            index (17-255; 0-16 are the basic colors)
+
+    Returns:
+        palette index or RGB tuple
+
+    Raises:
+        ValueError: not an extended color
+
+    '''
+    if isinstance(color, int) and not isinstance(color, bool):
+        if 17 <= color <= 255:
+            return color
+    elif isinstance(color, str) and color.startswith('#'):
+        digits = color[1:]
+        if len(digits) == 3:
+            digits = ''.join(digit * 2 for digit in digits)
+        if len(digits) == 6:
+            return (int(digits[0:2], 16), int(digits[2:4], 16),
+                    int(digits[4:6], 16))
+    raise ValueError(color)
+
+
+@lru_cache(maxsize=1024)
+def extended_color(color: Union[str, int],
+                   background: bool = False,
+                   depth: int = None) -> str:
+    '''
+    Escape sequence of an extended (256 or RGB) color
+
+    The color is downgraded to what ``depth`` supports: RGB to the
+    nearest 256-color index, either to the nearest basic color.
+    Sequences are memoized.
+
+    Args:
+        color: see ``parse_color``
+        background: escape for background
+        depth: color depth (default: detected ``DEPTH``)
+
+    Raises:
+        ValueError: not an extended color
+
+    '''
+    if depth is None:
+        depth = DEPTH
+    parsed = parse_color(color)
+    layer = 48 if background else 38
+    if isinstance(parsed, tuple):
+        if depth >= 24:
+            return '\x1b[%d;2;%d;%d;%dm' % (layer, *parsed)
+        parsed = nearest_palette(parsed)
+    if depth >= 8:
+        return '\x1b[%d;5;%dm' % (layer, parsed)
+    basic = nearest_basic(palette_rgb(parsed))
+    return (ANSI.BG_COLORS if background else ANSI.FG_COLORS)[basic]
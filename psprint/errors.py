@@ -48,6 +48,20 @@ class BadMark(PSPrintError):
         ''')
 
 
+class BadSink(PSPrintError):
+    '''
+    A ``sink`` supplied in ``config`` cannot be created
+
+    Args:
+        sink: name of sink
+        config: config file that defined the sink
+    '''
+    def __init__(self, sink: str, config: str) -> None:
+        super().__init__(f'''
+        Sink {sink} from {config} couldn't be created
+        ''')
+
+
 class BadPref(Exception):
     '''
     Prefix Style declared incorrectly
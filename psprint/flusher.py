@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Coalesced flushing
+
+'''
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class Flusher():
+    '''
+    Coalesce flushes of written streams
+
+    Streams are flushed at most ``latency`` seconds after they were
+    written to, or as soon as ``threshold`` characters are pending.
+
+    Args:
+        latency: maximum delay [s] between a write and its flush
+        threshold: pending characters that trigger an immediate flush
+
+    '''
+    def __init__(self, latency: float = 0.5, threshold: int = 1 << 16) -> None:
+        self.latency = latency
+        self.threshold = threshold
+        self._pending: Dict[int, Any] = {}
+        self._count = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def wrote(self, stream: Any, count: int) -> None:
+        '''
+        Register a write that needs flushing
+
+        Args:
+            stream: stream written to (has ``flush``; sinks ``publish``)
+            count: characters written
+
+        '''
+        with self._lock:
+            self._pending[id(stream)] = stream
+            self._count += count
+            if self._count < self.threshold:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.latency, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        '''
+        Flush all pending streams now
+        '''
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._count = 0
+            timer, self._timer = self._timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        for stream in pending.values():
+            if not getattr(stream, 'closed', False):
+                getattr(stream, 'publish', stream.flush)()
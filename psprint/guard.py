@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Output size guard: elide the middle of oversized arguments
+
+'''
+
+from collections import deque
+from itertools import islice
+from typing import Any, Iterable, List, Union
+
+_BINARY = (bytes, bytearray, memoryview)
+_BRACKETS = {
+    list: ('[', ']'),
+    tuple: ('(', ')'),
+    set: ('{', '}'),
+    frozenset: ('frozenset({', '})'),
+    dict: ('{', '}'),
+    deque: ('deque([', '])'),
+}
+
+
+def _head_lines(text: str, count: int) -> int:
+    '''
+    End index of the first ``count`` lines of ``text`` (with newline)
+    '''
+    stop = 0
+    for _ in range(count):
+        stop = text.find('\n', stop) + 1
+    return stop
+
+
+def _tail_lines(text: str, count: int) -> int:
+    '''
+    Start index of the last ``count`` lines of ``text``
+    '''
+    start = len(text)
+    for _ in range(count):
+        start = text.rfind('\n', 0, start - 1) + 1
+    return start
+
+
+def _reprs(items: Iterable[Any], pairs: bool, budget: int) -> List[str]:
+    '''
+    ``repr`` of leading ``items`` until they take ``budget`` characters
+    (at least one item)
+    '''
+    reprs: List[str] = []
+    used = 0
+    for item in items:
+        reprs.append('%r: %r' % item if pairs else repr(item))
+        used += len(reprs[-1]) + 2
+        if used >= budget:
+            break
+    return reprs
+
+
+def _bounded(arg: Any, max_len: int) -> str:
+    '''
+    Head and tail items of a built-in container, in about ``max_len``
+    characters, and the number of items elided between them
+    '''
+    pairs = isinstance(arg, dict)
+    items = arg.items() if pairs else arg
+    budget = max(max_len // 2, 1)
+    head = _reprs(items, pairs, budget)
+    try:
+        backwards = reversed(items)
+    except TypeError:
+        # sets (and dicts before python 3.8): keep only the last items
+        backwards = reversed(deque(items, maxlen=budget))
+    tail = _reprs(islice(backwards, len(arg) - len(head)), pairs, budget)
+    tail.reverse()
+    elided = len(arg) - len(head) - len(tail)
+    opening, closing = _BRACKETS[type(arg)]
+    middle = [f'... {elided} items elided ...'] if elided else []
+    return opening + ', '.join(head + middle + tail) + closing
+
+
+def elide(arg: Any, max_len: int = 0, max_lines: int = 0) -> Any:
+    '''
+    Keep the head and tail of an oversized argument
+
+    Strings and binary arguments are measured with ``len`` and sliced,
+    so their full text is never built. Built-in containers with more
+    than ``max_len`` items (each takes a character at least) render only
+    their head and tail items and the number of items elided; other
+    objects are converted with ``str`` first. Arguments within the
+    limits are returned as they are.
+
+    Args:
+        arg: argument to print
+        max_len: maximum characters (bytes for binary args) (0: no limit)
+        max_lines: maximum lines (0: no limit)
+
+    Returns:
+        ``arg`` or ``head ... N <units> elided ... tail``
+
+    '''
+    if isinstance(arg, _BINARY):
+        if not max_len or len(arg) <= max_len:
+            return arg
+        head = max_len // 2
+        tail = len(arg) - (max_len - head)
+        return (f'{bytes(arg[:head])!r} ... {tail - head} bytes elided'
+                f' ... {bytes(arg[tail:])!r}')
+    if max_len and type(arg) in _BRACKETS and len(arg) > max_len:
+        return _bounded(arg, max_len)
+    text: Union[str, Any] = arg if isinstance(arg, str) else str(arg)
+    if max_lines and text.count('\n') >= max_lines:
+        head = _head_lines(text, (max_lines + 1) // 2)
+        tail = _tail_lines(text, max_lines // 2) if max_lines > 1 else len(
+            text)
+        elided = text.count('\n', head, tail) + (tail == len(text)
+                                                 and not text.endswith('\n'))
+        if elided:
+            text = ''.join((text[:head], f'... {elided} lines elided ...\n',
+                            text[tail:]))
+    if max_len and len(text) > max_len:
+        head = max_len // 2
+        tail = len(text) - (max_len - head)
+        text = ''.join((text[:head], f' ... {tail - head} characters elided'
+                        ' ... ', text[tail:]))
+    return arg if text is arg else text
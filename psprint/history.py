@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+In-memory history of recent messages
+
+'''
+
+import itertools
+import time
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+class History():
+    '''
+    Preallocated ring of the last ``size`` messages
+
+    Marks and args are stored by reference, unrendered, with the time
+    and location of the call so a late dump renders them as they were.
+    Slot indices come from a pre-built cycle, so the ring never grows
+    once every slot has been used.
+
+    Args:
+        size: number of messages kept
+
+    '''
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._marks: List[Any] = [None] * size
+        self._args: List[tuple] = [()] * size
+        self._times: List[float] = [0.0] * size
+        self._locations: List[Optional[str]] = [None] * size
+        self._slots = itertools.cycle(range(size))
+        self._last = -1
+
+    def push(self, mark: Any, args: tuple, where: str = None) -> None:
+        '''
+        Remember a message, forgetting the oldest one
+
+        Args:
+            mark: resolved mark
+            args: args of the message
+            where: location of the call (if the mark locates)
+
+        '''
+        slot = next(self._slots)
+        self._marks[slot] = mark
+        self._args[slot] = args
+        self._times[slot] = time.time()
+        self._locations[slot] = where
+        self._last = slot
+
+    def records(self) -> Iterator[Tuple[Any, tuple, float, Optional[str]]]:
+        '''
+        Remembered messages, oldest first
+
+        Yields:
+            mark, args, epoch time of the call, location (or ``None``)
+
+        '''
+        start = (self._last + 1) % self.size
+        for slot in itertools.chain(range(start, self.size), range(start)):
+            if self._marks[slot] is not None:
+                yield (self._marks[slot], self._args[slot],
+                       self._times[slot], self._locations[slot])
+
+    def clear(self) -> None:
+        '''
+        Forget all messages
+        '''
+        for slot in range(self.size):
+            self._marks[slot] = None
+            self._args[slot] = ()
+            self._locations[slot] = None
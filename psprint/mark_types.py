@@ -22,11 +22,12 @@ Information Marker
 '''
 
 import warnings
-from typing import Dict, Union
+from typing import Dict, Tuple, Union
 
 from .ansi import ANSI
 from .errors import ValueWarning
 from .text_types import AnsiEffect, PrintPref
+from .throttle import TokenBucket
 
 DEFAULT_STYLE: Dict[str, int] = {'color': 16, 'gloss': 1, 'bgcol': 16}
 '''
@@ -42,6 +43,14 @@ class InfoMark():
     Attributes:
         pref: PrintPref: Prefix text properties
         text: PrintText: Text properties
+        locate: bool: show caller's ``file:line:function`` after prefix
+        limit: TokenBucket: rate limit shared with derived marks
+        mute: bool: do not print (messages are kept in history)
+        dump: bool: print history of muted messages before this mark
+        flush: bool: flush the output immediately after this mark
+        route: tuple: names of sinks that receive this mark (empty: all)
+        max_len: int: longer args are elided in the middle (0: no limit)
+        max_lines: int: args with more lines are elided (0: no limit)
 
     Args:
         parent: Inherit information from-
@@ -63,6 +72,16 @@ class InfoMark():
                 * text_gloss: gloss of text
                 * text_bgcol: background color of text
 
+            * locate: show caller's ``file:line:function`` after prefix
+            * rate: messages per second allowed (token bucket)
+            * burst: messages allowed in a burst
+            * mute: do not print (messages are kept in history)
+            * dump: print history of muted messages before this mark
+            * flush: flush the output immediately after this mark
+            * sink: name or list of names of sinks that receive this mark
+            * max_len: maximum characters of each arg
+            * max_lines: maximum lines of each arg
+
     '''
     def __init__(self,
                  parent: 'InfoMark' = None,
@@ -104,6 +123,23 @@ class InfoMark():
                               pref_max=pref_max,
                               **pref_args)
         self.text = AnsiEffect(parent=parent_text, **text_args)
+        self.locate = bool(
+            kwargs.get('locate', parent.locate if parent else False))
+        self.mute = bool(kwargs.get('mute', parent.mute if parent else False))
+        self.dump = bool(kwargs.get('dump', parent.dump if parent else False))
+        self.flush = bool(
+            kwargs.get('flush', parent.flush if parent else False))
+        self.max_len = int(
+            kwargs.get('max_len', parent.max_len if parent else 0) or 0)
+        self.max_lines = int(
+            kwargs.get('max_lines', parent.max_lines if parent else 0) or 0)
+        route = kwargs.get('sink', parent.route if parent else ())
+        self.route: Tuple[str, ...] = (route, ) if isinstance(
+            route, str) else tuple(route or ())
+        if kwargs.get('rate') is not None:
+            self.limit = TokenBucket(kwargs['rate'], kwargs.get('burst'))
+        else:
+            self.limit = parent.limit if parent else None
 
     def __repr__(self) -> str:
         '''
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Inline markup: ``"done [g]42[/] items"``
+
+'''
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from .ansi import ANSI
+
+TAG = re.compile(r'\[(/|[a-z][a-z ]*)\]')
+'''
+Opening ``[<name>]`` or closing ``[/]`` tag
+
+'''
+
+
+def _tags() -> Dict[str, str]:
+    '''
+    Escape of every tag name: color names (``ansi.yml``), gloss names
+    that are not color names and ``on <color>`` for backgrounds
+    '''
+    tags: Dict[str, str] = {}
+    for name, code in ANSI.FG_COLORS.items():
+        if isinstance(name, str):
+            tags[name] = code
+    for name, code in ANSI.GLOSS.items():
+        if isinstance(name, str):
+            tags.setdefault(name, code)
+    for name, code in ANSI.BG_COLORS.items():
+        if isinstance(name, str):
+            tags['on ' + name] = code
+    return tags
+
+
+TAGS = _tags()
+'''
+Escape sequence of each known tag name
+
+'''
+
+
+def render_markup(template: str, base: Optional[str] = None) -> str:
+    '''
+    Replace markup tags of ``template`` by escape sequences
+
+    Tags nest: ``[/]`` resets and re-applies ``base`` and the tags still
+    open. Unknown tags are left as they are. Not cached: messages are
+    mostly unique; see :func:`render_template`.
+
+    Args:
+        template: text with markup
+        base: style of the text around the markup (``None``: strip tags,
+            for bland output)
+
+    Returns:
+        text with escape sequences (or without tags)
+
+    '''
+    if '[' not in template:
+        return template
+    out: List[str] = []
+    stack: List[str] = []
+    start = 0
+    for match in TAG.finditer(template):
+        name = match.group(1)
+        if name == '/':
+            if not stack:
+                continue
+            stack.pop()
+            code = ANSI.RESET_ALL + base + ''.join(
+                stack) if base is not None else ''
+        elif name in TAGS:
+            stack.append(TAGS[name])
+            code = TAGS[name] if base is not None else ''
+        else:
+            continue
+        out.append(template[start:match.start()])
+        out.append(code)
+        start = match.end()
+    out.append(template[start:])
+    return ''.join(out)
+
+
+@lru_cache(maxsize=1024)
+def render_template(template: str, base: Optional[str] = None) -> str:
+    '''
+    :func:`render_markup`, cached per ``(template, base)``
+
+    For ``str.format`` templates reused with varying values
+    (``psprintf``), so repeated templates skip parsing.
+
+    Args:
+        template: ``str.format`` template with markup
+        base: as for :func:`render_markup`
+
+    Returns:
+        template with escape sequences (or without tags)
+
+    '''
+    return render_markup(template, base)
@@ -21,15 +21,80 @@
 Information- Prepended Print object
 '''
 
+import atexit
+import keyword
 import os
+import signal
 import sys
-from typing import Dict, List, Optional, Union
+import threading
+import time
+import warnings
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import chain, islice
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Set, Tuple, Union)
 
 import yaml
 
 from .ansi import ANSI
-from .errors import BadMark
+from .errors import (BadMark, BadPref, BadSink, BadStyle, KeyWarning,
+                     ValueWarning)
+from .flusher import Flusher
+from .guard import elide
+from .history import History
 from .mark_types import InfoMark
+from .markup import render_markup, render_template
+from .sinks import FileSink, Sink, StdSink, make_sink
+from .stamps import TimeStamp, locate
+from .status import StatusLine
+from .throttle import Collapser
+from .watcher import Watcher
+from .width import terminal_width, visible_width, wrap
+
+
+def _split_lines(text: str) -> Iterator[str]:
+    '''
+    Lines of ``text``, sliced one at a time
+    '''
+    start = 0
+    while start < len(text):
+        stop = text.find('\n', start)
+        if stop < 0:
+            yield text[start:]
+            return
+        yield text[start:stop]
+        start = stop + 1
+
+
+def _flush_at_exit(ref: 'weakref.ref[PrintSpace]') -> None:
+    '''
+    Flush a ``PrintSpace`` (if alive) when the interpreter exits
+    '''
+    space = ref()
+    if space is not None:
+        space.flush()
+
+
+def _hook_excepthook(space: 'PrintSpace') -> None:
+    '''
+    Dump ``space``'s history before reporting uncaught exceptions
+    '''
+    if space._excepthook:
+        return
+    space._excepthook = True
+    ref = weakref.ref(space)
+    chained = sys.excepthook
+
+    def excepthook(*exc_info) -> None:
+        space = ref()
+        if space is not None:
+            space.dump_history()
+            space.flush()
+        chained(*exc_info)
+
+    sys.excepthook = excepthook
 
 
 class PrintSpace():
@@ -38,11 +103,29 @@ class PrintSpace():
 
     Args:
         config: path to default configuration file (shipped)
+        outputs: configure outputs (``file``, ``sinks``, ``history``) from
+            configuration files; ``False`` reads only styles and switches
 
     Attributes:
+        configs: list: configuration files, in the order they are applied
+        (missing files are skipped by ``reload``)
         pref_max: int: maximum length of prefix string
+        stamp: TimeStamp: timestamp rendered before prefix (``None``: off)
+        collapse: Collapser: collapse repeated messages (``None``: off)
+        sinks: dict: named sinks that replace ``print_kwargs['file']``;
+        marks with a ``sink`` route go only to the named sinks (built-in:
+        ``stdout``, ``stderr``)
+        history: History: recent messages, unrendered (``None``: off)
+        flusher: Flusher: coalesced flush policy (``None``: flush only
+        marks with ``flush`` or when ``print_kwargs['flush']``)
+        status_rate: float: repaints per second of the ``status`` line
+        wrap_width: int: columns to ``wrap`` at (``None``: terminal width)
         info_style; dict: pre-defined prefix styles
         info_index: list: keys of `info_style` mapped to int
+        (``info_style`` and ``info_index`` are swapped together by
+        ``reload``)
+        <mark>: callable: ``psprint`` with pre-bound ``mark``, generated for
+        each mark in ``info_style`` that is a valid, unused attribute name
         print_kwargs: dict : library of kwargs_accepted by print_function
         switches: dict: user-customizations: pad, short, bland, disabled
 
@@ -50,15 +133,22 @@ class PrintSpace():
             short: bool: display short, 1 character- prefix
             bland: bool: do not show ANSI color/styles for prefix/text
             disabled: bool: behave like python default print_function
+            wrap: bool: wrap text with a hanging indent the width of prefix
+            lines: prefix of continuation lines: ``False`` (none),
+            ``'each'`` / ``True`` (full prefix), ``'indent'`` (blank)
+            markup: bool: replace inline tags like ``[g]42[/]`` in text
 
     '''
-    def __init__(self, config: os.PathLike) -> None:
+    def __init__(self, config: os.PathLike, outputs: bool = True) -> None:
         # Standard info styles
         self.switches = {
             'pad': False,
             'short': False,
             'bland': False,
-            'disabled': False
+            'disabled': False,
+            'wrap': False,
+            'lines': False,
+            'markup': False
         }
         self.print_kwargs = {
             'file': sys.stdout,
@@ -67,9 +157,54 @@ class PrintSpace():
             'flush': False
         }
         self.pref_max = None
-        self.info_style: Dict[str, InfoMark] = {}
-        self.info_index: List[str] = []
+        self.stamp: Optional[TimeStamp] = None
+        self.collapse: Optional[Collapser] = None
+        self.sinks: Dict[str, Sink] = {}
+        self._routes: Dict[InfoMark, Tuple[Sink, ...]] = {}
+        self._std_sinks = {
+            name: StdSink(name)
+            for name in ('stdout', 'stderr')
+        }
+        self.history: Optional[History] = None
+        self.flusher: Optional[Flusher] = None
+        self.status_rate: float = 10
+        self.wrap_width: Optional[int] = None
+        self._status: Optional[StatusLine] = None
+        self._excepthook = False
+        self._scope: ContextVar = ContextVar(
+            f'psprint_scope_{id(self)}', default=None)
+        # styles and their order are swapped together by ``reload``
+        self._styles: Tuple[Dict[str, InfoMark], List[str]] = ({}, [])
+        self._bound: Set[str] = set()
+        self._outputs = outputs
+        self.configs: List[os.PathLike] = []
+        self._reloading = threading.Lock()
+        self._watcher: Optional[Watcher] = None
         self.set_opts(config=config)
+        if outputs:
+            atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @property
+    def info_style(self) -> Dict[str, InfoMark]:
+        '''
+        Pre-defined prefix styles
+        '''
+        return self._styles[0]
+
+    @info_style.setter
+    def info_style(self, value: Dict[str, InfoMark]) -> None:
+        self._styles = (value, self._styles[1])
+
+    @property
+    def info_index(self) -> List[str]:
+        '''
+        Keys of ``info_style`` mapped to int
+        '''
+        return self._styles[1]
+
+    @info_index.setter
+    def info_index(self, value: List[str]) -> None:
+        self._styles = (self._styles[0], value)
 
     def set_opts(self, config: os.PathLike = None) -> None:
         '''
@@ -80,13 +215,19 @@ class PrintSpace():
 
         Raises:
             BadMark
+            BadSink
 
         '''
         if config is None:
             return
+        if config not in self.configs:
+            self.configs.append(config)
         info_index: Optional[Dict[str, str]] = None
         with open(config, 'r') as rcfile:
             conf: Dict[str, dict] = yaml.safe_load(rcfile)
+        if not isinstance(conf, dict):
+            # empty (e.g. truncated while being saved) or not a mapping
+            raise BadMark('<document>', rcfile.name)
         for mark, settings in conf.items():
             if mark == "FLAGS":
                 # switches / flags
@@ -96,11 +237,37 @@ class PrintSpace():
                 self.print_kwargs['sep'] = settings.get("sep", "\t")
                 self.print_kwargs['end'] = settings.get("end", "\n")
                 self.print_kwargs['flush'] = settings.get("flush", False)
+                stamp_fmt = settings.get("timestamp", None)
+                self.stamp = TimeStamp(
+                    stamp_fmt, settings.get("timestamp_digits", 3)
+                ) if stamp_fmt else None
+                self.collapse = Collapser() if settings.get(
+                    "collapse", False) else None
+                self.status_rate = settings.get("status_rate", 10)
+                self.wrap_width = settings.get("wrap_width", None)
+                latency = settings.get("flush_latency", None)
+                self.flusher = Flusher(latency,
+                                       settings.get("flush_chars", 1 << 16)
+                                       ) if latency is not None else None
+                if not self._outputs:
+                    continue
+                history = settings.get("history", 0)
+                self.history = History(history) if history else None
+                if history:
+                    _hook_excepthook(self)
                 fname = settings.get("file", None)  # Discouraged
                 if fname is not None:  # pragma: no cover
-                    self.print_kwargs['file'] = open(fname, "a")
+                    self.print_kwargs['file'] = FileSink(fname)
             elif mark == 'order':
                 info_index = settings
+            elif mark == 'sinks':
+                if not self._outputs:
+                    continue
+                for name, sink_conf in settings.items():
+                    try:
+                        self.add_sink(name, make_sink(**sink_conf))
+                    except (KeyError, TypeError, OSError):
+                        raise BadSink(str(name), rcfile.name) from None
             else:
                 # Mark definition
                 try:
@@ -110,6 +277,91 @@ class PrintSpace():
         if info_index is not None:
             self.info_index = list(
                 filter(lambda x: x in self.info_style, info_index))
+        if self._outputs:
+            # styles only (reload): routed after the swap
+            self._reroute(warn=True)
+
+    def reload(self) -> str:
+        '''
+        Re-read ``configs`` and swap in the styles they define
+
+        Styles (marks, their order and ``pref_max_len``) are built in a
+        separate ``PrintSpace`` and swapped in by a single assignment:
+        concurrent prints see either the old or the new styles, never a
+        mix, and take no lock. Switches, print kwargs, sinks and other
+        outputs are left as they are.
+
+        Returns
+            Summary of new (updated) ``PrintSpace``
+
+        Raises:
+            BadMark
+
+        '''
+        with self._reloading:
+            configs = [
+                config for config in self.configs if os.path.isfile(config)
+            ]
+            if not configs:
+                return str(self)
+            fresh = PrintSpace(config=configs[0], outputs=False)
+            for config in configs[1:]:
+                fresh.set_opts(config)
+            old_style = self.info_style
+            self.pref_max = fresh.pref_max
+            self._styles = fresh._styles
+            for mark in old_style:
+                if mark not in self.info_style:
+                    self._unbind(mark)
+            for mark in self.info_style:
+                self._bind(mark)
+            self._reroute(warn=True)
+        return str(self)
+
+    def _reload_quietly(self) -> None:
+        '''
+        ``reload`` from the watcher: a broken file only warns
+        '''
+        try:
+            self.reload()
+        except (BadMark, BadPref, BadStyle, OSError, yaml.YAMLError) as err:
+            warnings.warn(f'Styles not reloaded: {err}',
+                          category=ValueWarning)
+
+    def watch(self, interval: float = 2.0, sighup: bool = True) -> None:
+        '''
+        Reload styles whenever ``configs`` change
+
+        Modification times of ``configs`` are polled by a daemon thread
+        every ``interval`` seconds. Optionally, ``SIGHUP`` triggers an
+        immediate reload (only when called from the main thread, on
+        platforms with ``SIGHUP``). Reloading never happens on the
+        printing thread. A broken configuration only warns
+        (``ValueWarning``); the previous styles are kept.
+
+        Args:
+            interval: seconds between polls
+            sighup: also reload on ``SIGHUP``
+
+        '''
+        self.unwatch()
+        self._watcher = Watcher(lambda: list(self.configs),
+                                self._reload_quietly,
+                                interval=interval)
+        self._watcher.start()
+        if sighup and hasattr(signal, 'SIGHUP') and \
+           threading.current_thread() is threading.main_thread():
+            watcher = self._watcher
+            signal.signal(signal.SIGHUP, lambda *_: watcher.poke())
+
+    def unwatch(self) -> None:
+        '''
+        Stop watching ``configs`` (``SIGHUP`` handler is left in place
+        but has no effect)
+        '''
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
 
     def edit_style(self,
                    pref: str,
@@ -139,6 +391,10 @@ class PrintSpace():
                     * text_gloss: gloss of text
                     * text_bgcol: background color of text
 
+                * locate: show caller's ``file:line:function``
+                * rate: messages per second allowed (token bucket)
+                * burst: messages allowed in a burst
+
         Returns
             Summary of new (updated) ``PrintSpace``
 
@@ -153,6 +409,8 @@ class PrintSpace():
         else:
             self.info_index.insert(index_int, mark)
         self.info_style[mark] = InfoMark(pref_max=self.pref_max, **kwargs)
+        self._bind(mark)
+        self._reroute()
         return str(self)
 
     def remove_style(self, mark: str = None, index_int: int = None) -> str:
@@ -174,8 +432,131 @@ class PrintSpace():
             At least one of ``mark`` and ``index_int`` should be provided
             ''')
         del self.info_style[mark]
+        self.info_index = [idx for idx in self.info_index if idx != mark]
+        self._unbind(mark)
+        self._reroute()
         return str(self)
 
+    def add_sink(self, name: str, sink: Sink) -> None:
+        '''
+        Add (or replace) a named sink
+
+        While any sink is configured, messages that do not override
+        ``file`` are written to every sink instead of
+        ``print_kwargs['file']``.
+
+        Args:
+            name: name of sink
+            sink: sink
+
+        '''
+        old = self.sinks.get(name)
+        self.sinks[name] = sink
+        self._reroute()
+        if old is not None and old is not sink:
+            old.close()
+
+    def remove_sink(self, name: str) -> Sink:
+        '''
+        Remove a named sink (it is flushed, not closed)
+
+        Args:
+            name: name of sink
+
+        Returns:
+            removed sink
+
+        '''
+        sink = self.sinks.pop(name)
+        self._reroute()
+        sink.flush()
+        return sink
+
+    def _route(self, route: Tuple[str, ...]) -> Tuple[Sink, ...]:
+        '''
+        Sinks named in ``route``; unknown names are ignored with a warning
+        '''
+        sinks = []
+        for name in route:
+            sink = self.sinks.get(name) or self._std_sinks.get(name)
+            if sink is None:
+                warnings.warn(f"Unknown sink '{name}' is not routed to",
+                              category=KeyWarning)
+            else:
+                sinks.append(sink)
+        return tuple(sinks)
+
+    def _reroute(self, warn: bool = False) -> None:
+        '''
+        Resolve the mark -> sinks table of marks with a ``sink`` route
+
+        Args:
+            warn: warn about unknown sinks (not while configuring: they
+                may be yet to be added)
+
+        '''
+        with warnings.catch_warnings():
+            if not warn:
+                warnings.simplefilter('ignore', KeyWarning)
+            self._routes = {
+                mark: self._route(mark.route)
+                for mark in self.info_style.values() if mark.route
+            }
+
+    def _bind(self, mark: str) -> None:
+        '''
+        Expose a pre-bound printer for ``mark`` as attribute ``self.<mark>``
+
+        Marks that are not identifiers or clash with other attributes
+        are not exposed.
+
+        Args:
+            mark: name of a mark in ``info_style``
+
+        '''
+        if mark not in self._bound and (not mark.isidentifier()
+                                        or keyword.iskeyword(mark)
+                                        or hasattr(self, mark)):
+            return
+        self._bound.add(mark)
+        setattr(self, mark, self._printer(mark, self.info_style[mark]))
+
+    def _unbind(self, mark: str) -> None:
+        '''
+        Remove the pre-bound printer of ``mark``
+        '''
+        if mark in self._bound:
+            self._bound.discard(mark)
+            delattr(self, mark)
+
+    def _printer(self, name: str, mark: InfoMark) -> Callable[..., None]:
+        '''
+        Printer with ``mark`` resolved in advance
+
+        Calls without kwargs skip mark resolution and all merging; calls
+        with kwargs behave like ``psprint``.
+
+        Args:
+            name: name of ``mark``
+            mark: resolved mark
+
+        '''
+        def printer(*args, **kwargs) -> None:
+            if kwargs:
+                self.psprint(*args, mark=mark, **kwargs)
+                return
+            _, switches, print_kwargs = self._scope.get() or self._base()
+            if switches['disabled'] or not args:
+                self._print(args, print_kwargs)
+                return
+            self._emit(args, mark, switches, print_kwargs)
+
+        printer.__name__ = name
+        printer.__doc__ = f'''
+            ``psprint`` with pre-bound mark ``{name}``
+            '''
+        return printer
+
     def __repr__(self) -> str:
         '''
         Returns:
@@ -214,7 +595,9 @@ class PrintSpace():
                     * text_bgcol: background color of text
 
         '''
-        base_mark: InfoMark = self.info_style['cont']
+        # single read: a concurrent ``reload`` swaps both together
+        info_style, info_index = self._styles
+        base_mark: InfoMark = info_style['cont']
         if mark is not None:
             # mark was supplied
             if isinstance(mark, InfoMark):
@@ -222,12 +605,12 @@ class PrintSpace():
                 base_mark = mark
             elif isinstance(mark, int):
                 # mark supplied as index int
-                if not 0 <= mark < len(self.info_index):
+                if not 0 <= mark < len(info_index):
                     mark = 0
-                base_mark = self.info_style[self.info_index[mark]]
+                base_mark = info_style[info_index[mark]]
             elif isinstance(mark, str):
                 # mark named key supplied
-                base_mark = self.info_style.get(mark) or base_mark
+                base_mark = info_style.get(mark) or base_mark
             else:
                 raise BadMark(mark=str(mark), config="**kwargs")
         if any(arg in kwargs for arg in [
@@ -239,10 +622,71 @@ class PrintSpace():
                 'text_color',
                 'text_gloss',
                 'text_bgcol',
+                'locate',
+                'mute',
+                'dump',
+                'max_len',
+                'max_lines',
         ]):
             return InfoMark(parent=base_mark, pref_max=self.pref_max, **kwargs)
         return base_mark
 
+    def _base(self) -> Tuple[None, Dict[str, bool], Dict[str, Any]]:
+        '''
+        Unscoped mark, switches and print kwargs
+        '''
+        return None, self.switches, self.print_kwargs
+
+    @staticmethod
+    def _merge(base: Dict[str, Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Values of ``base``'s keys, overridden by ``kwargs``
+        '''
+        return {key: kwargs.get(key, value) for key, value in base.items()}
+
+    def _resolve(self, mark: Union[str, int, InfoMark, None],
+                 base_mark: Optional[InfoMark],
+                 kwargs: Dict[str, Any]) -> InfoMark:
+        '''
+        Resolve ``mark``, defaulting to the scope's (pre-resolved) mark
+        '''
+        if mark is None:
+            if base_mark is not None and not kwargs:
+                return base_mark
+            mark = base_mark
+        return self._which_mark(mark=mark, **kwargs)
+
+    @contextmanager
+    def scope(self,
+              mark: Union[str, int, InfoMark] = None,
+              **kwargs) -> Iterator['PrintSpace']:
+        '''
+        Context in which ``mark``, switches and print kwargs are resolved
+        once, up front.
+
+        Calls to ``psfmt`` and ``psprint`` inside the context use the
+        frozen values and skip all merging, unless they pass overrides.
+        Scopes nest and are local to the thread / asyncio task
+        (``contextvars``) that entered them.
+
+        Args:
+            mark: default mark inside the scope
+            **kwargs: any kwargs accepted by ``psprint``
+
+        Yields:
+            self
+
+        '''
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if mark is not None or kwargs:
+            base_mark = self._resolve(mark, base_mark, kwargs)
+        token = self._scope.set((base_mark, self._merge(switches, kwargs),
+                                 self._merge(print_kwargs, kwargs)))
+        try:
+            yield self
+        finally:
+            self._scope.reset(token)
+
     def psfmt(self,
               *args,
               mark: Union[str, int, InfoMark] = None,
@@ -283,10 +727,16 @@ class PrintSpace():
                     * text_gloss: gloss of text
                     * text_bgcol: background color of text
 
+                * locate: show caller's ``file:line:function``
+                * max_len: int: elide the middle of longer args
+                * max_lines: int: elide the middle lines of longer args
                 * pad: bool: prefix is padded to start text at the same level
                 * short: bool: display short, 1 character- prefix
                 * bland: bool: do not show ANSI color/styles for prefix/text
                 * disabled: bool: behave like python default print_function
+                * wrap: bool: wrap text with a hanging indent
+                * lines: {False, 'each', 'indent'}: continuation lines
+                * markup: bool: replace inline tags like ``[g]42[/]``
 
         Raises:
 
@@ -297,33 +747,109 @@ class PrintSpace():
             * PSPRINT-like represented args. When `these` args is printed
               using standard print, PSPRINT-like output appears.
             * If a sep is provided, it is used to join args and return a string
+            * With switches ``wrap`` or ``lines`` and no sep, args are joined
+              with a space into a single (continued) arg
 
         """
-        switches = {
-            key: {
-                **self.switches,
-                **kwargs
-            }[key]
-            for key in self.switches
-        }
+        base_mark, switches, _ = self._scope.get() or self._base()
+        if kwargs:
+            switches = self._merge(switches, kwargs)
 
-        args_l = list(args)  # typecast
         if switches['disabled'] or not args:
+            args_l = list(args)  # typecast
             if sep is not None:
                 return sep.join(args_l)
             return args_l
 
-        mark = self._which_mark(mark=mark, **kwargs)
+        return self._render(args,
+                            self._resolve(mark, base_mark, kwargs),
+                            switches,
+                            sep=sep)
+
+    def _render(self,
+                args: tuple,
+                mark: InfoMark,
+                switches: Dict[str, bool],
+                sep: str = None,
+                when: Union[float, str] = None,
+                where: str = None) -> Union[List[str], str]:
+        '''
+        Prefix args with a resolved mark and switches
 
+        Args:
+            args: non-empty args to print
+            mark: resolved mark
+            switches: resolved switches
+            sep: If not ``None``, return `*args` joined by separator.
+                Else, switches ``wrap`` and ``lines`` join them with a space
+                into a single arg.
+            when: epoch time stamped, or captured stamp text (default: now)
+            where: location rendered if the mark locates (default: caller)
+
+        '''
+        if mark.max_len or mark.max_lines:
+            args_l = [elide(arg, mark.max_len, mark.max_lines) for arg in args]
+        else:
+            args_l = list(args)  # typecast
+        if switches.get('markup'):
+            base = None if switches.get('bland') else str(mark.text)
+            args_l = [
+                render_markup(arg, base) if isinstance(arg, str) else arg
+                for arg in args_l
+            ]
         # add prefix to *args[0]
         if not switches.get('bland'):
             args_l[0] = str(mark.text) + str(args_l[0])
             args_l[-1] = str(args_l[-1]) + ANSI.RESET_ALL
-        args_l[0] = mark.pref.to_str(**switches) + str(args_l[0])
+        if mark.locate:
+            args_l[0] = (where or locate()) + ' ' + str(args_l[0])
+        prefix = mark.pref.to_str(**switches)
+        if self.stamp is not None:
+            stamp = when if isinstance(when, str) else self.stamp(when)
+            if stamp:
+                prefix = stamp + ' ' + prefix
+        if switches.get('wrap') or switches.get('lines'):
+            # continuation lines need the whole text: a single arg
+            text = prefix + self._continued(
+                (' ' if sep is None else sep).join(map(str, args_l)), prefix,
+                mark, switches)
+            return [text] if sep is None else text
+        args_l[0] = prefix + str(args_l[0])
         if sep is not None:
-            return sep.join(args_l)
+            return sep.join(map(str, args_l))
         return args_l
 
+    def _continued(self, text: str, prefix: str, mark: InfoMark,
+                   switches: Dict[str, bool]) -> str:
+        '''
+        Prefix or indent continuation lines of ``text`` and wrap it
+
+        Args:
+            text: text after ``prefix``
+            prefix: rendered prefix of the first line
+            mark: resolved mark
+            switches: resolved switches (``wrap``, ``lines``)
+
+        '''
+        indent = visible_width(prefix)
+        if switches.get('lines') in (True, 'each'):
+            newline = '\n' + prefix
+            if not switches.get('bland'):
+                # prefix resets the style
+                newline += str(mark.text)
+        else:
+            newline = '\n' + ' ' * indent
+        if switches.get('wrap'):
+            return wrap(text,
+                        indent,
+                        self.wrap_width or terminal_width(),
+                        newline=newline)
+        if '\n' not in text:
+            return text
+        if text.endswith('\n'):
+            return text[:-1].replace('\n', newline) + '\n'
+        return text.replace('\n', newline)
+
     def psprint(self,
                 *args,
                 mark: Union[str, int, InfoMark] = None,
@@ -361,10 +887,16 @@ class PrintSpace():
                     * text_gloss: gloss of text
                     * text_bgcol: background color of text
 
+                * locate: show caller's ``file:line:function``
+                * max_len: int: elide the middle of longer args
+                * max_lines: int: elide the middle lines of longer args
                 * pad: bool: prefix is padded to start text at the same level
                 * short: bool: display short, 1 character- prefix
                 * bland: bool: do not show ANSI color/styles for prefix/text
                 * disabled: bool: behave like python default print_function
+                * wrap: bool: wrap text with a hanging indent
+                * lines: {False, 'each', 'indent'}: continuation lines
+                * markup: bool: replace inline tags like ``[g]42[/]``
                 * file: IO: passed to print function
                 * sep: str: passed to print function
                 * end: str: passed to print function
@@ -374,13 +906,540 @@ class PrintSpace():
             BadMark: mark couldn't be interpreted
 
         """
-        # Extract print-kwargs
-        print_kwargs = {
-            key: {
-                **self.print_kwargs,
-                **kwargs
-            }[key]
-            for key in self.print_kwargs
-        }
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if kwargs:
+            # Extract print-kwargs
+            print_kwargs = self._merge(print_kwargs, kwargs)
+            switches = self._merge(switches, kwargs)
+        if switches['disabled'] or not args:
+            self._print(args, print_kwargs)
+            return
+        self._emit(args, self._resolve(mark, base_mark, kwargs), switches,
+                   print_kwargs)
+
+    def psprintf(self,
+                 template: str,
+                 *values,
+                 mark: Union[str, int, InfoMark] = None,
+                 **kwargs) -> None:
+        '''
+        Print ``template`` with inline markup, formatted with ``values``
+
+        The markup of ``template`` (e.g. ``"done [g]{}[/] items"``) is
+        compiled once per template and mark style and cached; ``values``
+        are then filled in by ``str.format`` and are never parsed as
+        markup. Bland output strips the tags.
+
+        Args:
+            template: ``str.format`` template with markup
+            *values: positional values of the template
+            mark: as for ``psprint``
+            **kwargs: as for ``psprint``
+
+        '''
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if kwargs:
+            print_kwargs = self._merge(print_kwargs, kwargs)
+            switches = self._merge(switches, kwargs)
+        if switches['disabled']:
+            self._print((render_template(template).format(*values), ),
+                        print_kwargs)
+            return
+        info_mark = self._resolve(mark, base_mark, kwargs)
+        text = render_template(
+            template,
+            None if switches['bland'] else str(info_mark.text)).format(*values)
+        if switches.get('markup'):
+            switches = {**switches, 'markup': False}
+        self._emit((text, ), info_mark, switches, print_kwargs)
+
+    def _emit(self, args: tuple, mark: InfoMark, switches: Dict[str, bool],
+              print_kwargs: Dict[str, Any]) -> None:
+        '''
+        Remember, apply flood control and print
+
+        Muting, rate limits and collapsing are checked before any
+        formatting.
+
+        Args:
+            args: non-empty args to print
+            mark: resolved mark
+            switches: resolved switches
+            print_kwargs: resolved kwargs for print function
+
+        '''
+        if self.history is not None:
+            if mark.dump:
+                self.dump_history()
+            self.history.push(mark, args,
+                              locate() if mark.locate else None)
+        if mark.mute:
+            return
+        if mark.limit is not None:
+            dropped = mark.limit.take()
+            if dropped is None:
+                return
+            if dropped:
+                self._write((f'{dropped} messages dropped by rate limit', ),
+                            mark, switches, print_kwargs)
+        if self.collapse is not None:
+            repeated, pending = self.collapse.push(
+                mark, args, (mark, switches, print_kwargs),
+                print_kwargs['file'])
+            if pending is not None:
+                self._repeated(*pending)
+            if repeated:
+                return
+        self._write(args, mark, switches, print_kwargs)
+
+    def dump_history(self, everything: bool = False) -> None:
+        '''
+        Render and print remembered messages, then forget them
+
+        A pending run of repeated messages is summarized first, next to
+        its message.
+
+        Args:
+            everything: dump all remembered messages, not only muted ones
+
+        '''
+        if self.history is None:
+            return
+        if self.collapse is not None:
+            pending = self.collapse.pop()
+            if pending is not None:
+                self._repeated(*pending)
+        records = list(self.history.records())
+        self.history.clear()
+        for mark, args, when, where in records:
+            if everything or mark.mute:
+                self._write(args,
+                            mark,
+                            self.switches,
+                            self.print_kwargs,
+                            when=when,
+                            where=where)
+
+    def replay(self,
+               *args,
+               mark: Union[str, int, InfoMark] = None,
+               when: Union[float, str] = None,
+               **kwargs) -> None:
+        '''
+        Print a message captured earlier, as ``psprint`` would have
+
+        History, muting, flood control and sinks do not apply: the
+        message is rendered and written to ``file`` directly.
+
+        Args:
+            *args: as for ``psprint``
+            mark: as for ``psprint``
+            when: epoch time of the message, or its captured stamp text
+                (``''``: no stamp; default: now)
+            **kwargs: as for ``psprint``
+
+        Raises:
+            BadMark: mark couldn't be interpreted
+
+        '''
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if kwargs:
+            print_kwargs = self._merge(print_kwargs, kwargs)
+            switches = self._merge(switches, kwargs)
+        if switches['disabled'] or not args:
+            self._print(args, print_kwargs)
+            return
+        info_mark = self._resolve(mark, base_mark, kwargs)
+        stream = print_kwargs['file']
+        if stream is None:
+            stream = sys.stdout
+        sep, end = print_kwargs['sep'], print_kwargs['end']
+        text = self._render(args,
+                            info_mark,
+                            switches,
+                            sep=' ' if sep is None else sep,
+                            when=when) + ('\n' if end is None else end)
+        self._write_text(stream, text)
+        self._flushed(stream, len(text), info_mark, print_kwargs)
+
+    def _repeated(self, context: tuple, count: int) -> None:
+        '''
+        Summarize a collapsed run of repeated messages
+        '''
+        self._write((f'last message repeated {count} times', ), *context)
+
+    def _write(self,
+               args: tuple,
+               mark: InfoMark,
+               switches: Dict[str, bool],
+               print_kwargs: Dict[str, Any],
+               when: float = None,
+               where: str = None) -> None:
+        '''
+        Render and write to file (``when``, ``where``: as for ``_render``)
+        '''
+        sinks = self._targets(mark, print_kwargs)
+        if sinks:
+            self._fan_out(args, mark, switches, print_kwargs, sinks, when,
+                          where)
+            return
+        stream = print_kwargs['file']
+        if stream is None:
+            stream = sys.stdout
+        sep, end = print_kwargs['sep'], print_kwargs['end']
+        # single write per message
+        text = self._render(args,
+                            mark,
+                            switches,
+                            sep=' ' if sep is None else sep,
+                            when=when,
+                            where=where) + ('\n' if end is None else end)
+        self._write_text(stream, text)
+        self._flushed(stream, len(text), mark, print_kwargs)
+
+    def _targets(self, mark: InfoMark,
+                 print_kwargs: Dict[str, Any]) -> Optional[Iterable[Sink]]:
+        '''
+        Sinks that ``mark`` is routed to (``None``: write to ``file``)
+        '''
+        if print_kwargs['file'] is not self.print_kwargs['file']:
+            # overridden: not routed
+            return None
+        sinks = self._routes.get(mark)
+        if sinks is None and mark.route:
+            sinks = self._route(mark.route)
+        if sinks:
+            return sinks
+        if self.sinks:
+            return self.sinks.values()
+        return None
+
+    def _flushed(self, stream: Any, count: int, mark: InfoMark,
+                 print_kwargs: Dict[str, Any]) -> None:
+        '''
+        Flush ``stream`` now, or leave it to the flush policy
+
+        Sinks are only published here; full syncs wait for :meth:`flush`.
+        '''
+        if print_kwargs['flush'] or mark.flush:
+            getattr(stream, 'publish', stream.flush)()
+        elif self.flusher is not None:
+            self.flusher.wrote(stream, count)
+
+    def _fan_out(self,
+                 args: tuple,
+                 mark: InfoMark,
+                 switches: Dict[str, bool],
+                 print_kwargs: Dict[str, Any],
+                 sinks: Iterable[Sink],
+                 when: float = None,
+                 where: str = None) -> None:
+        '''
+        Write to sinks, rendering each distinct variant once
+
+        Sinks of the status line's stream write above the status line.
+        '''
+        sep, end = print_kwargs['sep'], print_kwargs['end']
+        # as print does
+        sep = ' ' if sep is None else sep
+        end = '\n' if end is None else end
+        status = self._status
+        rendered: Dict[Any, str] = {}
+        for sink in sinks:
+            variant = sink.variant(switches)
+            text = rendered.get(variant)
+            if text is None:
+                text = rendered[variant] = sink.render(self,
+                                                       args,
+                                                       mark,
+                                                       switches,
+                                                       sep,
+                                                       end,
+                                                       when=when,
+                                                       where=where)
+            if status is not None and getattr(sink, 'stream',
+                                              None) is status.stream:
+                status.above(text)
+            else:
+                sink.write(text)
+            self._flushed(sink, len(text), mark, print_kwargs)
+
+    def table(self,
+              rows: Iterable[Sequence[Any]],
+              mark: Union[str, int, InfoMark] = 'list',
+              header: Sequence[Any] = None,
+              align: str = '',
+              gap: str = '  ',
+              sample: int = 1000,
+              batch: int = 1024,
+              **kwargs) -> None:
+        '''
+        Print rows as aligned columns, each row prefixed with ``mark``
+
+        Column widths are computed in a single pass over ``rows`` if it is
+        a sequence, else over its first ``sample`` rows (and ``header``);
+        longer cells in later rows push the rest of their row out. Widths
+        ignore ANSI codes and count wide characters as 2 columns. The
+        prefix is rendered once and rows are written ``batch`` at a time.
+        Rows are written to ``file`` directly: sinks, history and flood
+        control do not apply.
+
+        Args:
+            rows: rows of cells (any objects, converted by ``str``)
+            mark: as for ``psprint``
+            header: first row
+            align: ``<`` (left, default) or ``>`` (right) for each column
+            gap: separator of columns
+            sample: rows measured when ``rows`` is not a sequence
+            batch: rows per write
+            **kwargs: as for ``psprint`` (``sep`` is ignored)
+
+        '''
+        parts = self._bulk(mark, kwargs)
+
+        def measured(row: Sequence[Any]) -> List[Tuple[str, int]]:
+            return [(cell, visible_width(cell)) for cell in map(str, row)]
+
+        if isinstance(rows, Sequence):
+            remaining: Iterator[Sequence[Any]] = iter(())
+            measure: Iterable[Sequence[Any]] = rows
+        else:
+            remaining = iter(rows)
+            measure = islice(remaining, sample)
+        first = [measured(row) for row in chain(
+            (header, ) if header is not None else (), measure)]
+        widths: List[int] = []
+        for row in first:
+            for col, (_, width) in enumerate(row):
+                if col == len(widths):
+                    widths.append(width)
+                elif width > widths[col]:
+                    widths[col] = width
+        right = [char == '>' for char in align]
+        right.extend([False] * (len(widths) - len(right)))
+
+        def line(row: List[Tuple[str, int]]) -> str:
+            cells = []
+            last = len(row) - 1
+            for col, (cell, width) in enumerate(row):
+                fill = ' ' * (widths[col] - width) if col < len(widths) else ''
+                if col < len(right) and right[col]:
+                    cells.append(fill + cell)
+                elif col == last:
+                    cells.append(cell)
+                else:
+                    cells.append(cell + fill)
+            return gap.join(cells)
+
+        self._write_batches(map(line, chain(first, map(measured, remaining))),
+                            batch, parts)
+
+    def psprint_lines(self,
+                      iterable: Iterable[str],
+                      mark: Union[str, int, InfoMark] = None,
+                      batch: int = 1024,
+                      **kwargs) -> None:
+        '''
+        Print each line of ``iterable`` with the prefix of ``mark``
+
+        ``iterable`` is consumed lazily (a generator or an open file works;
+        trailing newlines are dropped) and written ``batch`` lines at a
+        time, so memory is bounded by the batch. A single string is split
+        line by line as it is consumed. With switch ``lines='indent'``,
+        only the first line is prefixed and the rest are indented. The
+        prefix is rendered once and lines are written to ``file`` or the
+        sinks of ``mark`` (as for ``psprint``). History and flood control
+        do not apply.
+
+        Args:
+            iterable: lines to print
+            mark: as for ``psprint``
+            batch: lines per write
+            **kwargs: as for ``psprint`` (``sep`` is ignored)
+
+        '''
+        lines = _split_lines(iterable) if isinstance(
+            iterable, str) else iter(iterable)
+        self._write_batches((line.rstrip('\n') for line in lines), batch,
+                            self._bulk(mark, kwargs))
+
+    def _bulk(
+        self, mark: Union[str, int, InfoMark, None], kwargs: Dict[str, Any]
+    ) -> Tuple[str, str, str, Optional[InfoMark], Dict[str, bool],
+               Dict[str, Any], float, Optional[str]]:
+        '''
+        Parts of lines written in bulk
+
+        The timestamp and location are those of the call, for all lines.
+
+        Returns:
+            * prefix of the first line (with timestamp, location and style)
+            * prefix of the other lines (indent with ``lines='indent'``)
+            * suffix (style reset and ``end``)
+            * resolved mark (``None``: disabled)
+            * switches
+            * print kwargs
+            * time of the call
+            * location of the call (if the mark locates)
+
+        '''
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if kwargs:
+            print_kwargs = self._merge(print_kwargs, kwargs)
+            switches = self._merge(switches, kwargs)
+        lead = prefix = suffix = ''
+        info_mark = None
+        when = time.time()
+        where = None
+        if not switches['disabled']:
+            info_mark = self._resolve(mark, base_mark, kwargs)
+            prefix = info_mark.pref.to_str(**switches)
+            if self.stamp is not None:
+                prefix = self.stamp(when) + ' ' + prefix
+            lead = prefix
+            if switches.get('lines') == 'indent':
+                prefix = ' ' * visible_width(prefix)
+            if info_mark.locate:
+                where = locate()
+                lead += where + ' '
+            if not switches['bland']:
+                lead += str(info_mark.text)
+                prefix += str(info_mark.text)
+                suffix = ANSI.RESET_ALL
+        end = print_kwargs['end']
+        suffix += '\n' if end is None else end
+        return (lead, prefix, suffix, info_mark, switches, print_kwargs, when,
+                where)
+
+    def _write_batches(self, lines: Iterator[str], batch: int,
+                       parts: tuple) -> None:
+        '''
+        Write ``lines`` (without newlines), ``batch`` at a time
+
+        Routed lines are rendered by each sink, a batch per message with
+        continuation lines prefixed (with ``lines='indent'``, the first
+        line of each batch is prefixed).
 
-        print(*self.psfmt(*args, mark=mark, **kwargs), **print_kwargs)
+        Args:
+            lines: lines to write
+            batch: lines per write
+            parts: from :meth:`_bulk`
+
+        '''
+        (lead, prefix, suffix, mark, switches, print_kwargs, when,
+         where) = parts
+        sinks = None if mark is None else self._targets(mark, print_kwargs)
+        if sinks:
+            switches = {**switches, 'lines': switches.get('lines') or 'each'}
+            for block in iter(lambda: list(islice(lines, batch)), []):
+                self._fan_out(('\n'.join(block), ), mark, switches,
+                              print_kwargs, sinks, when, where)
+            return
+        stream = print_kwargs['file']
+        if stream is None:
+            stream = sys.stdout
+        first = next(lines, None)
+        if first is None:
+            return
+        rendered = chain((lead + first + suffix, ),
+                         (prefix + line + suffix for line in lines))
+        for text in iter(lambda: ''.join(islice(rendered, batch)), ''):
+            self._write_text(stream, text)
+        if print_kwargs['flush']:
+            stream.flush()
+
+    def _print(self, args: tuple, print_kwargs: Dict[str, Any]) -> None:
+        '''
+        Write ``args`` as ``print`` does, above the status line if any
+        '''
+        stream = print_kwargs['file']
+        if stream is None:
+            stream = sys.stdout
+        sep, end = print_kwargs['sep'], print_kwargs['end']
+        text = (' ' if sep is None else sep).join(map(str, args)) + (
+            '\n' if end is None else end)
+        self._write_text(stream, text)
+        if print_kwargs['flush']:
+            stream.flush()
+
+    def _write_text(self, stream: Any, text: str) -> None:
+        '''
+        Write rendered ``text`` to ``stream``, above the status line if any
+        '''
+        status = self._status
+        if status is not None and status.stream is stream:
+            status.above(text)
+        else:
+            stream.write(text)
+
+    def status(self,
+               *args,
+               mark: Union[str, int, InfoMark] = None,
+               **kwargs) -> None:
+        '''
+        Show args on a status line that is rewritten in place
+
+        Repaints are capped at ``status_rate`` per second; only the
+        newest args are kept between repaints. Lines printed with
+        ``psprint`` to the same file meanwhile appear above the status
+        line. If the file is not a TTY, repaints are plain lines.
+
+        Args:
+            *args: status (should fit on one line)
+            mark: as for ``psprint``
+            **kwargs: as for ``psprint`` (``end`` and ``flush`` are
+                ignored)
+
+        '''
+        base_mark, switches, print_kwargs = self._scope.get() or self._base()
+        if kwargs:
+            print_kwargs = self._merge(print_kwargs, kwargs)
+            switches = self._merge(switches, kwargs)
+        sep = print_kwargs['sep']
+        sep = ' ' if sep is None else sep
+        if switches['disabled'] or not args:
+            text = sep.join(map(str, args))
+        else:
+            text = self._render(args,
+                                self._resolve(mark, base_mark, kwargs),
+                                switches,
+                                sep=sep)
+        stream = print_kwargs['file']
+        if stream is None:
+            stream = sys.stdout
+        status = self._status
+        if status is None or status.stream is not stream:
+            if status is not None:
+                status.close()
+            status = self._status = StatusLine(stream, rate=self.status_rate)
+        status.update(text)
+
+    def end_status(self, keep: bool = True) -> None:
+        '''
+        Paint the pending status and leave status mode
+
+        Args:
+            keep: leave the last status on screen (else erase it)
+
+        '''
+        status, self._status = self._status, None
+        if status is not None:
+            status.close(keep=keep)
+
+    def flush(self) -> None:
+        '''
+        Summarize pending repeats and flush the output file and sinks
+        '''
+        if self._status is not None:
+            self._status.flush()
+        if self.collapse is not None:
+            pending = self.collapse.pop()
+            if pending is not None:
+                self._repeated(*pending)
+        if self.flusher is not None:
+            self.flusher.flush()
+        for sink in self.sinks.values():
+            sink.flush()
+        stream = self.print_kwargs['file']
+        if stream is not None and not getattr(stream, 'closed', False):
+            stream.flush()
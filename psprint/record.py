@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Compact binary records, rendered later
+
+Record layout (little-endian)::
+
+    header: b'H' | u16 n_marks | n_marks * (u16 len | utf-8 name)
+            | f64 wall-clock | f64 monotonic
+    record: b'R' | i16 mark id | f64 monotonic | u16 n_args
+            | n_args * (u32 len | utf-8 arg)
+
+Every opening of a record file appends a fresh header, so a file may
+hold several sessions, each with its own mark table.
+
+'''
+
+import os
+import struct
+import sys
+import time
+from typing import IO, Dict, Iterator, List, Tuple, Union
+
+from .errors import BadMark
+from .printer import PrintSpace
+
+MAGIC = b'PSPR\x01'
+'''
+First bytes of every record file
+
+'''
+
+_HEAD = struct.Struct('<dd')
+_RECORD = struct.Struct('<hdH')
+_LEN16 = struct.Struct('<H')
+_LEN32 = struct.Struct('<I')
+
+
+class RecordSink():
+    '''
+    Write compact binary records instead of formatted text.
+
+    No formatting happens while recording: marks are stored as indices
+    of ``space.info_index`` and args as length-prefixed utf-8 strings.
+    Use :func:`render` or ``python -m psprint render`` to obtain the
+    usual prefixed text.
+
+    Args:
+        path: record file (appended)
+        space: ``PrintSpace`` whose ``info_index`` defines mark ids
+        buffer_size: bytes buffered before each write to disk
+
+    '''
+    def __init__(self,
+                 path: os.PathLike,
+                 space: PrintSpace,
+                 buffer_size: int = 1 << 20) -> None:
+        self.path = path
+        self.mark_ids: Dict[str, int] = {
+            mark: idx
+            for idx, mark in enumerate(space.info_index)
+        }
+        self._stream = open(path, 'ab', buffering=buffer_size)
+        if self._stream.tell() == 0:
+            self._stream.write(MAGIC)
+        names = [mark.encode('utf-8') for mark in space.info_index]
+        self._stream.write(b''.join([
+            b'H',
+            _LEN16.pack(len(names)),
+            *(_LEN16.pack(len(name)) + name for name in names),
+            _HEAD.pack(time.time(), time.monotonic()),
+        ]))
+
+    def record(self, *args, mark: Union[str, int] = None, **_) -> None:
+        '''
+        Append one record
+
+        Args:
+            *args: objects to record (stored as ``str``)
+            mark: pre-declared mark name or index
+            **_: ignored, accepted for ``psprint`` compatibility
+
+        Raises:
+            BadMark: mark is neither name nor index
+
+        '''
+        if mark is None:
+            mark_id = 0
+        elif isinstance(mark, str):
+            mark_id = self.mark_ids.get(mark, 0)
+        elif isinstance(mark, int):
+            # as psprint: out-of-range indices fall back to 0
+            mark_id = mark if 0 <= mark < len(self.mark_ids) else 0
+        else:
+            raise BadMark(mark=str(mark), config="RecordSink")
+        parts = [b'R', _RECORD.pack(mark_id, time.monotonic(), len(args))]
+        for arg in args:
+            data = str(arg).encode('utf-8')
+            parts.append(_LEN32.pack(len(data)))
+            parts.append(data)
+        self._stream.write(b''.join(parts))
+
+    __call__ = record
+
+    def flush(self) -> None:
+        '''
+        Write buffered records to disk
+        '''
+        self._stream.flush()
+
+    def close(self) -> None:
+        '''
+        Flush and close the record file
+        '''
+        self._stream.close()
+
+    def __enter__(self) -> 'RecordSink':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _read(stream: IO[bytes], size: int) -> bytes:
+    '''
+    Read exactly ``size`` bytes, ``EOFError`` on truncation
+    '''
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError
+    return data
+
+
+def read_records(path: os.PathLike) -> Iterator[Tuple[str, float, List[str]]]:
+    '''
+    Iterate over records in a record file
+
+    A record truncated by a crash ends the iteration silently.
+
+    Args:
+        path: record file
+
+    Yields:
+        mark name, wall-clock time [epoch seconds], args
+
+    Raises:
+        ValueError: ``path`` is not a record file
+
+    '''
+    with open(path, 'rb') as stream:
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a psprint record file')
+        names: List[str] = []
+        offset = 0.
+        try:
+            while True:
+                tag = stream.read(1)
+                if not tag:
+                    return
+                if tag == b'H':
+                    (count, ) = _LEN16.unpack(_read(stream, 2))
+                    names = []
+                    for _ in range(count):
+                        (size, ) = _LEN16.unpack(_read(stream, 2))
+                        names.append(_read(stream, size).decode('utf-8'))
+                    wall, mono = _HEAD.unpack(_read(stream, _HEAD.size))
+                    offset = wall - mono
+                elif tag == b'R':
+                    mark_id, mono, count = _RECORD.unpack(
+                        _read(stream, _RECORD.size))
+                    args = []
+                    for _ in range(count):
+                        (size, ) = _LEN32.unpack(_read(stream, 4))
+                        args.append(_read(stream, size).decode('utf-8'))
+                    mark = names[mark_id] if 0 <= mark_id < len(
+                        names) else 'cont'
+                    yield mark, mono + offset, args
+                else:
+                    raise ValueError(f'{path} is corrupt at {stream.tell()}')
+        except EOFError:
+            return
+
+
+def render(path: os.PathLike, space: PrintSpace, **kwargs) -> int:
+    '''
+    Print records from a record file as ``space.psprint`` would have
+
+    Records are replayed with their recorded time: history, muting and
+    flood control of ``space`` do not apply.
+
+    Args:
+        path: record file
+        space: ``PrintSpace`` whose styles render the records
+        **kwargs: passed to ``space.replay``
+
+    Returns:
+        Number of records rendered
+
+    '''
+    kwargs.setdefault('file', sys.stdout)
+    count = 0
+    for mark, when, args in read_records(path):
+        space.replay(*args, mark=mark, when=when, **kwargs)
+        count += 1
+    return count
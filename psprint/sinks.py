@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Output sinks
+
+A ``PrintSpace`` with configured sinks renders each message once per
+distinct variant (switch set) and writes it to every sink of that variant.
+
+'''
+
+import atexit
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import weakref
+import zlib
+from typing import (IO, TYPE_CHECKING, Any, Callable, Dict, Hashable, List,
+                    Optional, Tuple)
+
+from .guard import elide
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .mark_types import InfoMark
+    from .printer import PrintSpace
+
+
+class Sink():
+    '''
+    Text sink
+
+    Args:
+        stream: text stream written to
+        **switches: switches (pad, short, bland) overriding the caller's
+
+    '''
+    def __init__(self, stream: IO[str], **switches: bool) -> None:
+        self.stream = stream
+        self.switches = switches
+
+    @classmethod
+    def from_config(cls, file: str, **kwargs: Any) -> 'Sink':
+        '''
+        Create sink from configuration
+
+        Args:
+            file: ``stdout``, ``stderr`` or path of a file (appended)
+            **kwargs: passed to constructor
+
+        '''
+        if file == 'stdout':
+            stream = sys.stdout
+        elif file == 'stderr':
+            stream = sys.stderr
+        else:
+            stream = open(file, 'a')
+        return cls(stream, **kwargs)
+
+    def variant(self, switches: Dict[str, bool]) -> Hashable:
+        '''
+        Identity of the rendered text; sinks of equal variants share it
+
+        Args:
+            switches: switches of the call
+
+        '''
+        if not self.switches:
+            return tuple(switches.values())
+        return tuple(
+            self.switches.get(key, value) for key, value in switches.items())
+
+    def render(self,
+               space: 'PrintSpace',
+               args: tuple,
+               mark: 'InfoMark',
+               switches: Dict[str, bool],
+               sep: str,
+               end: str,
+               when: float = None,
+               where: str = None) -> str:
+        '''
+        Render a message for this sink
+
+        Args:
+            space: ``PrintSpace`` rendering the message
+            args: args of the message
+            mark: resolved mark
+            switches: switches of the call
+            sep: separator between args
+            end: appended to the message
+            when: epoch time of the message (default: now)
+            where: location of the call (default: caller)
+
+        '''
+        if self.switches:
+            switches = {**switches, **self.switches}
+        return space._render(args,
+                             mark,
+                             switches,
+                             sep=sep,
+                             when=when,
+                             where=where) + end
+
+    def write(self, text: str) -> None:
+        '''
+        Write rendered text
+        '''
+        self.stream.write(text)
+
+    def publish(self) -> None:
+        '''
+        Make written text visible to readers, cheaply
+
+        Called for per-message flushes; :meth:`flush` stays the full
+        sync point (:meth:`PrintSpace.flush`, exit).
+        '''
+        self.flush()
+
+    def flush(self) -> None:
+        '''
+        Flush the stream
+        '''
+        self.stream.flush()
+
+    def close(self) -> None:
+        '''
+        Flush the stream and close it, unless it is a standard stream
+        '''
+        if self.stream in (sys.stdout, sys.stderr, sys.__stdout__,
+                           sys.__stderr__):
+            self.flush()
+            return
+        self.stream.close()
+
+
+class StdSink(Sink):
+    '''
+    Sink of a standard stream, looked up when written to
+
+    Follows reassignment of ``sys.stdout`` / ``sys.stderr``.
+
+    Args:
+        name: ``stdout`` or ``stderr``
+        **switches: switches (pad, short, bland) overriding the caller's
+
+    '''
+    def __init__(self, name: str, **switches: bool) -> None:
+        self.name = name
+        super().__init__(getattr(sys, name), **switches)
+
+    @property  # type: ignore
+    def stream(self) -> IO[str]:
+        '''
+        Current standard stream
+        '''
+        return getattr(sys, self.name)
+
+    @stream.setter
+    def stream(self, _) -> None:
+        pass
+
+
+class JSONSink(Sink):
+    '''
+    Sink of JSON lines: ``{"time": ..., "mark": ..., "text": ...}``
+
+    ``mark`` is the long prefix of the mark; oversized args are elided
+    as for text output.
+
+    Args:
+        stream: text stream written to
+
+    '''
+    def __init__(self, stream: IO[str], **_) -> None:
+        import json  # only JSON sinks pay for the import
+        super().__init__(stream)
+        self._dumps = json.dumps
+
+    def variant(self, switches: Dict[str, bool]) -> Hashable:
+        return 'json'
+
+    def render(self,
+               space: 'PrintSpace',
+               args: tuple,
+               mark: 'InfoMark',
+               switches: Dict[str, bool],
+               sep: str,
+               end: str,
+               when: float = None,
+               where: str = None) -> str:
+        if mark.max_len or mark.max_lines:
+            args = tuple(
+                elide(arg, mark.max_len, mark.max_lines) for arg in args)
+        return self._dumps({
+            'time': time.time() if when is None else when,
+            'mark': mark.pref.pref[0],
+            'text': sep.join(map(str, args)),
+        }) + '\n'
+
+
+_OPEN: 'weakref.WeakSet[Sink]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    '''
+    Close sinks that own files when the interpreter exits
+    '''
+    for sink in list(_OPEN):
+        sink.close()
+
+
+class FileSink(Sink):
+    '''
+    Buffered file sink, rotated by size
+
+    On rotation, the file is renamed and a new one opened; closing the
+    old file and shifting backups (``path.1`` ... ``path.<backups>``)
+    happen on a background thread. Sinks are closed at exit.
+
+    Args:
+        path: log file (appended)
+        buffer_size: bytes buffered before each write to disk
+        max_bytes: rotate when the file reaches this size (0: never)
+        backups: number of rotated files kept
+        **switches: switches (pad, short, bland) overriding the caller's
+
+    '''
+    def __init__(self,
+                 path: os.PathLike,
+                 buffer_size: int = 1 << 16,
+                 max_bytes: int = 0,
+                 backups: int = 5,
+                 **switches: bool) -> None:
+        self.path = os.fspath(path)
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.backups = backups
+        super().__init__(open(self.path, 'ab', buffering=buffer_size),
+                         **switches)
+        self._size = self.stream.tell()
+        self._lock = threading.Lock()
+        self._rotated = 0
+        self._worker: Optional[threading.Thread] = None
+        self._queue: 'queue.Queue[Optional[Tuple[IO[bytes], str]]]' = (
+            queue.Queue())
+        _OPEN.add(self)
+
+    @classmethod
+    def from_config(cls, file: str, **kwargs: Any) -> 'Sink':
+        return cls(file, **kwargs)
+
+    def write(self, text: str) -> None:
+        data = text.encode('utf-8')
+        with self._lock:
+            self.stream.write(data)
+            self._size += len(data)
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self.stream.closed:
+                self.stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.stream.close()
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+        _OPEN.discard(self)
+
+    def _rotate(self) -> None:
+        '''
+        Rename the current file aside and continue in a new one
+        '''
+        self._rotated += 1
+        aside = f'{self.path}.rotating-{os.getpid()}-{self._rotated}'
+        os.rename(self.path, aside)
+        old = self.stream
+        self.stream = open(self.path, 'ab', buffering=self.buffer_size)
+        self._size = 0
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._shift,
+                                            name='psprint-rotate',
+                                            daemon=True)
+            self._worker.start()
+        self._queue.put((old, aside))
+
+    def _shift(self) -> None:
+        '''
+        Background: close rotated files and shift backups
+        '''
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            old, aside = job
+            old.close()
+            if self.backups < 1:
+                os.remove(aside)
+                continue
+            for num in range(self.backups - 1, 0, -1):
+                src = f'{self.path}.{num}'
+                if os.path.exists(src):
+                    os.replace(src, f'{self.path}.{num + 1}')
+            os.replace(aside, f'{self.path}.1')
+
+
+def _bz2(level: int) -> Any:
+    import bz2  # imported on first use: keeps ``import psprint`` cheap
+    return bz2.BZ2Compressor(level)
+
+
+def _lzma(level: int) -> Any:
+    import lzma
+    return lzma.LZMACompressor(preset=level)
+
+
+COMPRESSORS: Dict[str, Callable[[int], Any]] = {
+    'gzip': lambda level: zlib.compressobj(level, zlib.DEFLATED, 31),
+    'bz2': _bz2,
+    'lzma': _lzma,
+}
+'''
+Compressor factories by method, called with compression level
+(``bz2`` and ``lzma`` are imported on first use)
+
+'''
+
+_SYNC = object()
+
+
+class CompressedSink(Sink):
+    '''
+    Compressed file sink (gzip, bz2 or lzma)
+
+    Lines are batched and compressed on a background thread. At every
+    sync point the current compressed member is completed and flushed to
+    disk, so the file remains readable (``gzip.open``, ``bz2.open``,
+    ``lzma.open``) up to the last sync point after a crash.
+
+    Args:
+        path: compressed file (appended)
+        method: key of ``COMPRESSORS``
+        level: compression level
+        batch: characters batched before compression
+        sync_every: seconds between sync points
+        **switches: switches overriding the caller's (default: bland)
+
+    '''
+    def __init__(self,
+                 path: os.PathLike,
+                 method: str = 'gzip',
+                 level: int = 6,
+                 batch: int = 1 << 16,
+                 sync_every: float = 5.,
+                 **switches: bool) -> None:
+        switches.setdefault('bland', True)
+        self.path = os.fspath(path)
+        self.level = level
+        self.batch = batch
+        self.sync_every = sync_every
+        self._compressor = COMPRESSORS[method]
+        super().__init__(open(self.path, 'ab'), **switches)
+        self._lines: List[str] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue[Any]' = queue.Queue()
+        self._worker = threading.Thread(target=self._compress,
+                                        name='psprint-compress',
+                                        daemon=True)
+        self._worker.start()
+        _OPEN.add(self)
+
+    @classmethod
+    def from_config(cls, file: str, **kwargs: Any) -> 'Sink':
+        return cls(file, **kwargs)
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            self._lines.append(text)
+            self._pending += len(text)
+            if self._pending >= self.batch:
+                self._hand_off()
+
+    def _hand_off(self) -> None:
+        '''
+        Pass batched lines to the compressor thread
+        '''
+        if self._lines:
+            self._queue.put(''.join(self._lines))
+            self._lines = []
+            self._pending = 0
+
+    def publish(self) -> None:
+        '''
+        Pass batched lines to the compressor thread without waiting
+        '''
+        if self._worker.is_alive():
+            with self._lock:
+                self._hand_off()
+
+    def flush(self) -> None:
+        '''
+        Compress batched lines and complete a sync point
+        '''
+        if not self._worker.is_alive():
+            return
+        with self._lock:
+            self._hand_off()
+        self._queue.put(_SYNC)
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            self.flush()
+            self._queue.put(None)
+            self._worker.join()
+        self.stream.close()
+        _OPEN.discard(self)
+
+    def _compress(self) -> None:
+        '''
+        Background: compress batches, complete members at sync points
+
+        When nothing was handed off for ``sync_every`` seconds, lines
+        still being batched are taken over and synced, so an idle sink
+        is never more than ``sync_every`` seconds behind on disk.
+        '''
+        compressor = None
+        synced = time.monotonic()
+        while True:
+            try:
+                job = self._queue.get(timeout=self.sync_every)
+            except queue.Empty:
+                with self._lock:
+                    job = ''.join(self._lines) or _SYNC
+                    self._lines = []
+                    self._pending = 0
+                queued, idle = False, True
+            else:
+                queued, idle = True, False
+            if job is not None and job is not _SYNC:
+                if compressor is None:
+                    compressor = self._compressor(self.level)
+                self.stream.write(compressor.compress(job.encode('utf-8')))
+            if compressor is not None and (
+                    idle or job is None or job is _SYNC
+                    or time.monotonic() - synced >= self.sync_every):
+                self.stream.write(compressor.flush())
+                self.stream.flush()
+                compressor = None
+                synced = time.monotonic()
+            if queued:
+                self._queue.task_done()
+            if job is None:
+                return
+
+
+RING_MAGIC = b'PSRING\x01\x00'
+'''
+First bytes of a ring buffer file
+
+'''
+
+_RING_HEAD = struct.Struct('<QQQ')  # capacity, write offset, wraps
+_RING_DATA = len(RING_MAGIC) + _RING_HEAD.size
+
+
+class RingSink(Sink):
+    '''
+    Memory-mapped ring buffer: keeps the last ``size`` bytes of output
+
+    Writes are memory copies into a shared file mapping (no write
+    syscalls); the kernel persists them even if the process crashes.
+    The header holds the write offset and wrap count. Read the ring in
+    order with :func:`read_ring` or ``python -m psprint ring <path>``.
+
+    Args:
+        path: ring file (re-used if its capacity matches)
+        size: capacity in bytes
+        **switches: switches overriding the caller's (default: bland)
+
+    '''
+    def __init__(self,
+                 path: os.PathLike,
+                 size: int = 1 << 22,
+                 **switches: bool) -> None:
+        switches.setdefault('bland', True)
+        self.path = os.fspath(path)
+        self.size = size
+        stream = open(self.path, 'a+b')
+        stream.seek(0)
+        head = stream.read(_RING_DATA)
+        if head[:len(RING_MAGIC)] == RING_MAGIC and _RING_HEAD.unpack_from(
+                head, len(RING_MAGIC))[0] == size:
+            _, self._offset, self._wraps = _RING_HEAD.unpack_from(
+                head, len(RING_MAGIC))
+        else:
+            stream.truncate(0)
+            stream.write(RING_MAGIC + _RING_HEAD.pack(size, 0, 0))
+            stream.truncate(_RING_DATA + size)
+            stream.flush()
+            self._offset, self._wraps = 0, 0
+        import mmap  # only ring sinks pay for the import
+        super().__init__(stream, **switches)
+        self._map = mmap.mmap(stream.fileno(), _RING_DATA + size)
+        self._lock = threading.Lock()
+        _OPEN.add(self)
+
+    @classmethod
+    def from_config(cls, file: str, **kwargs: Any) -> 'Sink':
+        return cls(file, **kwargs)
+
+    def write(self, text: str) -> None:
+        data = text.encode('utf-8')
+        size = self.size
+        with self._lock:
+            if len(data) >= size:
+                self._wraps += (self._offset + len(data)) // size
+                self._offset = (self._offset + len(data)) % size
+                data = data[-size:]
+                start = self._offset
+            else:
+                start = self._offset
+                self._offset += len(data)
+                if self._offset >= size:
+                    self._offset -= size
+                    self._wraps += 1
+            start += _RING_DATA
+            head = _RING_DATA + size - start
+            if len(data) <= head:
+                self._map[start:start + len(data)] = data
+            else:
+                self._map[start:] = data[:head]
+                self._map[_RING_DATA:_RING_DATA + len(data) - head] = (
+                    data[head:])
+            _RING_HEAD.pack_into(self._map, len(RING_MAGIC), size,
+                                 self._offset, self._wraps)
+
+    def publish(self) -> None:
+        '''
+        Nothing to do: writes to the mapping are visible to readers
+        '''
+
+    def flush(self) -> None:
+        '''
+        Synchronize the mapping to disk (not needed to survive a crash)
+        '''
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._map.close()
+            self.stream.close()
+        _OPEN.discard(self)
+
+
+def read_ring(path: os.PathLike) -> bytes:
+    '''
+    Contents of a ring buffer file, oldest first
+
+    After the ring has wrapped, the (partially overwritten) oldest line
+    is dropped.
+
+    Args:
+        path: ring file written by ``RingSink``
+
+    Raises:
+        ValueError: ``path`` is not a ring file
+
+    '''
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    if data[:len(RING_MAGIC)] != RING_MAGIC:
+        raise ValueError(f'{path} is not a psprint ring file')
+    size, offset, wraps = _RING_HEAD.unpack_from(data, len(RING_MAGIC))
+    ring = data[_RING_DATA:_RING_DATA + size]
+    if not wraps:
+        return ring[:offset]
+    ordered = ring[offset:] + ring[:offset]
+    return ordered[ordered.find(b'\n') + 1:]
+
+
+SINKS = {
+    'text': Sink,
+    'json': JSONSink,
+    'file': FileSink,
+    'compressed': CompressedSink,
+    'ring': RingSink,
+}
+'''
+Sink classes by ``kind`` in configuration
+
+'''
+
+
+def make_sink(kind: str = 'text', file: str = 'stdout', **kwargs: Any) -> Sink:
+    '''
+    Create a sink from its configuration
+
+    Args:
+        kind: key of ``SINKS``
+        file: ``stdout``, ``stderr`` or path of a file
+        **kwargs: passed to the sink class
+
+    Raises:
+        KeyError: unknown kind
+
+    '''
+    return SINKS[kind].from_config(file, **kwargs)
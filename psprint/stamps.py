@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Stamps rendered around the prefix
+
+'''
+
+import os
+import sys
+import time
+from types import CodeType
+from typing import Dict, Optional, Tuple
+
+_PACKAGE = __name__.rpartition('.')[0]
+_LOCATIONS: Dict[Tuple[CodeType, int], str] = {}
+_LOCATIONS_MAX = 4096
+
+
+class TimeStamp():
+    '''
+    Timestamp of the message
+
+    ``strftime`` is called only when the second changes; sub-second
+    digits are appended to the cached text.
+
+    Args:
+        fmt: ``time.strftime`` format of the seconds part
+        digits: number of sub-second digits (0: none)
+
+    '''
+    def __init__(self, fmt: str = '%H:%M:%S', digits: int = 3) -> None:
+        self.fmt = fmt
+        self.digits = digits
+        self._scale = 10**digits
+        # (second, formatted) swapped as a whole: consistent across threads
+        self._cache: Tuple[Optional[int], str] = (None, '')
+
+    def __call__(self, now: float = None) -> str:
+        '''
+        Formatted timestamp
+
+        Args:
+            now: epoch seconds (default: current time)
+
+        '''
+        if now is None:
+            now = time.time()
+        sec = int(now)
+        cached, text = self._cache
+        if sec != cached:
+            text = time.strftime(self.fmt, time.localtime(sec))
+            self._cache = (sec, text)
+        if not self.digits:
+            return text
+        return '%s.%0*d' % (text, self.digits, (now - sec) * self._scale)
+
+
+def locate() -> str:
+    '''
+    Location of the caller of psprint
+
+    The first frame outside the psprint package is rendered as
+    ``file:line:function``, cached per code object and line number.
+
+    Returns:
+        ``file:line:function``
+
+    '''
+    frame = sys._getframe(1)
+    while frame.f_back is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module != _PACKAGE and not module.startswith(_PACKAGE + '.'):
+            break
+        frame = frame.f_back
+    key = (frame.f_code, frame.f_lineno)
+    try:
+        return _LOCATIONS[key]
+    except KeyError:
+        pass
+    if len(_LOCATIONS) >= _LOCATIONS_MAX:
+        _LOCATIONS.clear()
+    code = frame.f_code
+    location = ':'.join((os.path.basename(code.co_filename),
+                         str(frame.f_lineno), code.co_name))
+    _LOCATIONS[key] = location
+    return location
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Status line rewritten in place
+
+'''
+
+import threading
+import time
+from typing import Any, Optional
+
+ERASE_LINE = '\x1b[K'
+'''
+Erase from the cursor to the end of the line
+
+'''
+
+
+class StatusLine():
+    '''
+    A single line of ``stream``, repainted at most ``rate`` times a second
+
+    Updates between repaints only replace the pending text: the newest
+    one is painted when the interval is over. On a TTY, the line is
+    rewritten in place (carriage return, text, erase to end of line) and
+    lines printed through ``above`` appear above it. On any other
+    stream, every repaint is a plain line.
+
+    Args:
+        stream: output stream
+        rate: repaints per second (0: no limit)
+        tty: rewrite in place (default: ``stream.isatty()``)
+
+    '''
+    def __init__(self, stream: Any, rate: float = 10,
+                 tty: bool = None) -> None:
+        self.stream = stream
+        self.interval = 1 / rate if rate else 0
+        if tty is None:
+            isatty = getattr(stream, 'isatty', None)
+            tty = bool(isatty is not None and isatty())
+        self.tty = tty
+        self._shown = ''
+        self._pending: Optional[str] = None
+        self._painted = float('-inf')
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def update(self, text: str) -> None:
+        '''
+        Show ``text`` now, or as soon as the rate allows
+
+        Args:
+            text: rendered status (a single line)
+
+        '''
+        with self._lock:
+            self._pending = text
+            wait = self._painted + self.interval - time.monotonic()
+            if wait <= 0:
+                self._paint()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def above(self, text: str) -> None:
+        '''
+        Write ``text`` (ending in a newline) above the status line
+
+        Args:
+            text: rendered line(s)
+
+        '''
+        with self._lock:
+            if self.tty and self._shown:
+                self.stream.write('\r' + ERASE_LINE + text + self._shown)
+            else:
+                self.stream.write(text)
+
+    def flush(self) -> None:
+        '''
+        Paint pending text now
+        '''
+        with self._lock:
+            timer, self._timer = self._timer, None
+            if self._pending is not None:
+                self._paint()
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+    def close(self, keep: bool = True) -> None:
+        '''
+        Paint pending text and leave status mode
+
+        Args:
+            keep: leave the last status on screen (else erase it)
+
+        '''
+        self.flush()
+        with self._lock:
+            if self.tty and self._shown:
+                self.stream.write('\n' if keep else '\r' + ERASE_LINE)
+                self.stream.flush()
+            self._shown = ''
+
+    def _paint(self) -> None:
+        '''
+        Write pending text (lock held)
+        '''
+        text, self._pending = self._pending or '', None
+        if self.tty:
+            self.stream.write('\r' + text + ERASE_LINE)
+            self._shown = text
+        else:
+            self.stream.write(text + '\n')
+        self.stream.flush()
+        self._painted = time.monotonic()
@@ -24,7 +24,7 @@ Text Parts
 
 from typing import List, Tuple, Union
 
-from .ansi import ANSI
+from .ansi import ANSI, extended_color
 from .errors import BadBGCol, BadColor, BadGloss, BadPrefix, BadShortPrefix
 
 
@@ -34,9 +34,10 @@ class AnsiEffect():
     Text to be printed to (ANSI) terminal
 
     Args:
-        color: color of text [0-15]
+        color: color of text [0-15], 256-color index [17-255] or
+            ``#rrggbb`` / ``#rgb`` (downgraded to the terminal's depth)
         gloss: gloss of text {0: bland, 1:normal ,2: dim, 3: bright}
-        bgcol: color of background [0-15]
+        bgcol: color of background (as ``color``)
 
     Attributes:
         color: color of text
@@ -59,18 +60,32 @@ class AnsiEffect():
 
         # modify
         try:
-            self.color: str = ANSI.FG_COLORS[color] if color else self.color
-        except KeyError:
+            self.color: str = self._color(color) if color else self.color
+        except (KeyError, ValueError):
             raise BadColor(color) from None
         try:
             self.gloss: str = ANSI.GLOSS[gloss] if gloss else self.gloss
         except KeyError:
             raise BadGloss(gloss) from None
         try:
-            self.bgcol: str = ANSI.BG_COLORS[bgcol] if bgcol else self.bgcol
-        except KeyError:
+            self.bgcol: str = self._color(
+                bgcol, background=True) if bgcol else self.bgcol
+        except (KeyError, ValueError):
             raise BadBGCol(bgcol) from None
 
+    @staticmethod
+    def _color(color: Union[str, int], background: bool = False) -> str:
+        '''
+        Escape of a basic color name/code or an extended (256, RGB) color
+
+        Raises:
+            KeyError, ValueError: unknown color
+        '''
+        try:
+            return (ANSI.BG_COLORS if background else ANSI.FG_COLORS)[color]
+        except KeyError:
+            return extended_color(color, background=background)
+
     @staticmethod
     def inherit(parent):
         '''
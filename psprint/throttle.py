@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Flood control: rate limits and collapsed repeats
+
+'''
+
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+
+class TokenBucket():
+    '''
+    Token bucket limiting messages of a mark
+
+    Args:
+        rate: tokens (messages) replenished per second
+        burst: maximum tokens saved up (default: ``rate``, at least 1)
+
+    Attributes:
+        dropped: messages denied since the last accepted message
+
+    '''
+    def __init__(self, rate: float, burst: float = None) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.dropped = 0
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> Optional[int]:
+        '''
+        Take a token for one message
+
+        Returns:
+            ``None`` if the message should be dropped, else the number
+            of messages dropped since the previous accepted message
+
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens < 1:
+                self.dropped += 1
+                return None
+            self._tokens -= 1
+            dropped, self.dropped = self.dropped, 0
+            return dropped
+
+
+class Collapser():
+    '''
+    Collapse consecutive identical messages
+
+    Messages are compared by mark and destination identity and hash of
+    args before any formatting. Unhashable args are never collapsed.
+
+    '''
+    def __init__(self) -> None:
+        self._last: Optional[Tuple[Any, int, tuple, Any, Any]] = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def push(self,
+             mark: Any,
+             args: tuple,
+             context: Any = None,
+             target: Any = None) -> Tuple[bool, Optional[Tuple[Any, int]]]:
+        '''
+        Register a message
+
+        Args:
+            mark: mark of the message
+            args: args of the message
+            context: returned with the summary of a finished run
+            target: destination of the message (e.g. resolved ``file``)
+
+        Returns:
+            * message is a repeat (suppress it)
+            * ``(context, repeats)`` of the run that just ended, if any
+
+        '''
+        try:
+            digest = hash(args)
+        except TypeError:
+            return False, self.pop()
+        with self._lock:
+            last = self._last
+            if last is not None and last[0] is mark and last[
+                    4] is target and last[1] == digest and last[2] == args:
+                self._count += 1
+                return True, None
+            pending = (last[3], self._count) if self._count else None
+            self._last = (mark, digest, args, context, target)
+            self._count = 0
+        return False, pending
+
+    def pop(self) -> Optional[Tuple[Any, int]]:
+        '''
+        Forget the last message
+
+        Returns:
+            ``(context, repeats)`` of the pending run, if any
+
+        '''
+        with self._lock:
+            last, count = self._last, self._count
+            self._last = None
+            self._count = 0
+        if last is None or not count:
+            return None
+        return last[3], count
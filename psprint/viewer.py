@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Indexed viewer for captured psprint text logs
+
+A sidecar index (``<log>.psidx``) holds the byte offset of every
+``bucket``-th line and, for each mark, the buckets in which that mark
+occurs. Queries seek straight to candidate buckets.
+
+'''
+
+import heapq
+import os
+import re
+import struct
+import warnings
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .errors import PSPrintWarning
+from .printer import PrintSpace
+from .stamps import TimeStamp
+
+BUCKET = 1024
+'''
+Default number of lines per indexed bucket
+
+'''
+
+ANSI_RE = re.compile(rb'\x1b\[[0-9;]*m')
+'''
+ANSI SGR escape sequence
+
+'''
+
+_MAGIC = b'PSIX\x01'
+_HEAD = struct.Struct('<QqQQIQ')
+_COUNT = struct.Struct('<Q')
+_NAME = struct.Struct('<H')
+_HEAD_SPAN = 4096
+
+
+def _head_crc(stream, size: int) -> int:
+    '''
+    Checksum of the first bytes of the log, detects replaced logs
+    '''
+    stream.seek(0)
+    return zlib.crc32(stream.read(min(size, _HEAD_SPAN)))
+
+
+def _stamp_pattern(stamp: Optional[TimeStamp]) -> bytes:
+    '''
+    Pattern matching timestamps rendered by ``stamp``
+    '''
+    if stamp is None:
+        return b''
+    pattern = ''.join(
+        '%' if part == '%%' else r'[\w+\-]+' if part.startswith('%')
+        and len(part) == 2 else re.escape(part)
+        for part in re.split('(%.)', stamp.fmt))
+    if stamp.digits:
+        pattern += r'\.\d{%d}' % stamp.digits
+    return f'(?:{pattern} )?'.encode('utf-8')
+
+
+class LogIndex():
+    '''
+    Sidecar index of a psprint text log
+
+    Args:
+        log: captured psprint output (with or without ANSI codes)
+        space: ``PrintSpace`` whose marks are recognized
+        bucket: lines per bucket
+
+    Attributes:
+        offsets: byte offset of the first line of each bucket
+        marks: sorted bucket numbers in which each mark occurs
+        lines: number of lines indexed
+
+    '''
+    def __init__(self,
+                 log: os.PathLike,
+                 space: PrintSpace,
+                 bucket: int = BUCKET) -> None:
+        self.log = Path(log)
+        self.path = self.log.with_name(self.log.name + '.psidx')
+        self.space = space
+        self.bucket = bucket
+        self.offsets = array('q')
+        self.marks: Dict[str, array] = {}
+        self.lines = 0
+        self._size = 0
+        self._mtime = 0
+        self._crc = 0
+        self._pattern, self._names = self._compile(space)
+
+    @staticmethod
+    def _compile(space: PrintSpace) -> Tuple['re.Pattern', Dict[bytes, str]]:
+        '''
+        Pattern matching any bracketed prefix of ``space``'s marks,
+        optionally preceded by ``space``'s timestamp
+        '''
+        names: Dict[bytes, str] = {}
+        for mark in space.info_index:
+            if mark not in space.info_style:
+                continue
+            for pref in space.info_style[mark].pref.pref:
+                if pref:
+                    names.setdefault(pref.encode('utf-8'), mark)
+        alternatives = b'|'.join(
+            re.escape(pref) for pref in sorted(names, key=len, reverse=True))
+        pattern = b''.join(
+            (_stamp_pattern(space.stamp), rb'\[(', alternatives, rb')\]'))
+        return re.compile(pattern), names
+
+    def classify(self, line: bytes) -> Tuple[Optional[str], int]:
+        '''
+        Identify the mark of a line
+
+        Args:
+            line: raw line (may contain ANSI codes)
+
+        Returns:
+            mark name (``None`` for lines without a known prefix),
+            end of prefix in the ANSI-stripped line
+
+        '''
+        if b'\x1b' in line:
+            line = ANSI_RE.sub(b'', line)
+        found = self._pattern.match(line)
+        if found is None:
+            return None, 0
+        return self._names[found.group(1)], found.end()
+
+    def _load(self) -> bool:
+        '''
+        Load the sidecar index
+
+        Returns:
+            ``True`` if an index was loaded
+        '''
+        try:
+            with open(self.path, 'rb') as stream:
+                if stream.read(len(_MAGIC)) != _MAGIC:
+                    return False
+                (self._size, self._mtime, self.lines, bucket, count,
+                 self._crc) = _HEAD.unpack(stream.read(_HEAD.size))
+                if bucket != self.bucket:
+                    return False
+                self.offsets = array('q')
+                (size, ) = _COUNT.unpack(stream.read(_COUNT.size))
+                self.offsets.fromfile(stream, size)
+                self.marks = {}
+                for _ in range(count):
+                    (size, ) = _NAME.unpack(stream.read(_NAME.size))
+                    name = stream.read(size).decode('utf-8')
+                    (size, ) = _COUNT.unpack(stream.read(_COUNT.size))
+                    self.marks[name] = array('q')
+                    self.marks[name].fromfile(stream, size)
+        except (OSError, EOFError, struct.error):
+            return False
+        return True
+
+    def _save(self) -> None:
+        '''
+        Write the sidecar index
+
+        An index that can't be written (e.g. read-only log directory)
+        only warns: the index in memory still serves queries.
+        '''
+        try:
+            with open(self.path, 'wb') as stream:
+                stream.write(_MAGIC)
+                stream.write(
+                    _HEAD.pack(self._size, self._mtime, self.lines,
+                               self.bucket, len(self.marks), self._crc))
+                stream.write(_COUNT.pack(len(self.offsets)))
+                self.offsets.tofile(stream)
+                for name, buckets in self.marks.items():
+                    data = name.encode('utf-8')
+                    stream.write(_NAME.pack(len(data)) + data)
+                    stream.write(_COUNT.pack(len(buckets)))
+                    buckets.tofile(stream)
+        except OSError as err:
+            warnings.warn(f'Index not saved: {err}', category=PSPrintWarning)
+
+    def update(self, rebuild: bool = False) -> 'LogIndex':
+        '''
+        Bring the index up to date with the log
+
+        Logs that only grew since the last update are scanned from the
+        last indexed bucket onwards. Shrunk or replaced logs are
+        re-indexed from the start.
+
+        Args:
+            rebuild: discard any existing index
+
+        Returns:
+            self
+
+        '''
+        stat = self.log.stat()
+        with open(self.log, 'rb') as stream:
+            loaded = not rebuild and self._load()
+            if loaded and (self._size, self._mtime) == (stat.st_size,
+                                                        stat.st_mtime_ns):
+                return self
+            if not loaded or stat.st_size < self._size or _head_crc(
+                    stream, self._size) != self._crc or not self.offsets:
+                self.offsets = array('q')
+                self.marks = {}
+                self.lines = 0
+                offset = 0
+            else:
+                # re-scan the last (possibly incomplete) bucket
+                last = len(self.offsets) - 1
+                offset = self.offsets[last]
+                self.lines = last * self.bucket
+                for buckets in self.marks.values():
+                    while buckets and buckets[-1] >= last:
+                        buckets.pop()
+                del self.offsets[last:]
+            self._scan(stream, offset)
+            self._size = stat.st_size
+            self._mtime = stat.st_mtime_ns
+            self._crc = _head_crc(stream, self._size)
+        self._save()
+        return self
+
+    def _scan(self, stream, offset: int) -> None:
+        '''
+        Index lines starting at byte ``offset``
+        '''
+        stream.seek(offset)
+        bucket = self.bucket
+        classify = self.classify
+        marks = self.marks
+        current = len(self.offsets) - 1
+        for line in stream:
+            if self.lines % bucket == 0:
+                self.offsets.append(offset)
+                current += 1
+            name = classify(line)[0] or 'cont'
+            buckets = marks.get(name)
+            if buckets is None:
+                buckets = marks[name] = array('q')
+            if not buckets or buckets[-1] != current:
+                buckets.append(current)
+            offset += len(line)
+            self.lines += 1
+
+    def query(self,
+              marks: Iterable[str] = None,
+              from_line: int = 1,
+              to_line: int = None) -> Iterator[Tuple[int, str, bytes]]:
+        '''
+        Lines of the log filtered by mark and line number
+
+        Args:
+            marks: mark names to show (``None``: all)
+            from_line: first line number (1-based)
+            to_line: last line number (inclusive)
+
+        Yields:
+            line number, mark name, raw line
+
+        '''
+        first = max(from_line, 1) - 1
+        last = self.lines if to_line is None else min(to_line, self.lines)
+        start_bucket = first // self.bucket
+        if marks is None:
+            wanted = None
+            buckets: Iterable[int] = range(start_bucket, len(self.offsets))
+        else:
+            wanted = set(marks)
+            buckets = (bkt for bkt in _unique(
+                heapq.merge(*(self.marks.get(name, ()) for name in wanted)))
+                       if bkt >= start_bucket)
+        with open(self.log, 'rb') as stream:
+            for bkt in buckets:
+                lineno = bkt * self.bucket
+                if lineno >= last:
+                    return
+                stream.seek(self.offsets[bkt])
+                for _ in range(self.bucket):
+                    line = stream.readline()
+                    if not line or lineno >= last:
+                        break
+                    lineno += 1
+                    if lineno <= first:
+                        continue
+                    name = self.classify(line)[0] or 'cont'
+                    if wanted is None or name in wanted:
+                        yield lineno, name, line
+
+
+def _unique(sorted_ints: Iterable[int]) -> Iterator[int]:
+    '''
+    Unique values of a sorted iterable
+    '''
+    previous = None
+    for value in sorted_ints:
+        if value != previous:
+            previous = value
+            yield value
+
+
+def view(log: os.PathLike,
+         space: PrintSpace,
+         marks: Iterable[str] = None,
+         from_line: int = 1,
+         to_line: int = None,
+         rebuild: bool = False,
+         raw: bool = False,
+         **kwargs) -> int:
+    '''
+    Print filtered lines of a captured log, re-rendered with ``space``
+
+    Args:
+        log: captured psprint output
+        space: ``PrintSpace`` used to recognize and render marks
+        marks: mark names to show (``None``: all)
+        from_line: first line number (1-based)
+        to_line: last line number (inclusive)
+        rebuild: discard any existing sidecar index
+        raw: print lines as captured, do not re-render
+        **kwargs: passed to ``space.replay`` (muted marks are shown)
+
+    Returns:
+        Number of lines shown
+
+    '''
+    index = LogIndex(log, space).update(rebuild=rebuild)
+    count = 0
+    for _, name, line in index.query(marks=marks,
+                                     from_line=from_line,
+                                     to_line=to_line):
+        count += 1
+        text = line.decode('utf-8', errors='replace').rstrip('\n')
+        if raw:
+            space.psprint(text, disabled=True, **kwargs)
+            continue
+        line = ANSI_RE.sub(b'', line)
+        found = index._pattern.match(line)
+        # keep the captured stamp (if any) instead of stamping now
+        stamp = b'' if found is None else line[:found.start(1) - 1]
+        text = line[0 if found is None else found.end():].decode(
+            'utf-8', errors='replace').rstrip('\n')
+        if found is not None:
+            text = text.lstrip(' ')
+        space.replay(text,
+                     mark=name,
+                     when=stamp.rstrip(b' ').decode('utf-8'),
+                     **kwargs)
+    return count
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Watch configuration files for changes
+
+'''
+
+import os
+import threading
+import warnings
+from typing import Callable, Iterable, Optional, Tuple
+
+from .errors import PSPrintWarning
+
+
+def _mtimes(paths: Iterable[os.PathLike]) -> Tuple[Optional[int], ...]:
+    '''
+    Modification times [ns] of ``paths`` (``None``: missing)
+    '''
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+class Watcher():
+    '''
+    Poll files from a daemon thread and call back when they change
+
+    Files are only ``stat``-ed every ``interval`` seconds; creating,
+    modifying or deleting any of them counts as a change. The callback
+    runs on the watcher thread, never on the caller's; exceptions it
+    raises only warn (``PSPrintWarning``) and polling goes on.
+
+    Args:
+        paths: callable returning the files to watch
+        callback: called (without arguments) after a change
+        interval: seconds between polls
+
+    '''
+    def __init__(self,
+                 paths: Callable[[], Iterable[os.PathLike]],
+                 callback: Callable[[], None],
+                 interval: float = 2.0) -> None:
+        self.paths = paths
+        self.callback = callback
+        self.interval = interval
+        self._wake = threading.Event()
+        self._poked = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._stamps: Tuple[Optional[int], ...] = ()
+
+    def start(self) -> None:
+        '''
+        Start polling (no-op if already started)
+        '''
+        if self._running:
+            return
+        self._running = True
+        self._stamps = _mtimes(self.paths())
+        self._thread = threading.Thread(target=self._run,
+                                        name='psprint-watcher',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stop polling and wait for the thread to finish
+        '''
+        self._running = False
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def poke(self) -> None:
+        '''
+        Call back at the next wake-up regardless of modification times
+
+        Safe to call from a signal handler: only sets a flag and an event.
+        '''
+        self._poked = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._running:
+                return
+            current = _mtimes(self.paths())
+            if current == self._stamps and not self._poked:
+                continue
+            self._poked = False
+            self._stamps = current
+            try:
+                self.callback()
+            except Exception as err:  # keep watching: next poll may do
+                warnings.warn(f'Watcher callback failed: {err!r}',
+                              category=PSPrintWarning)
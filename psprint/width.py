@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+Visible width of text on a terminal
+
+'''
+
+import re
+import shutil
+import signal
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional
+
+ESCAPE = re.compile(r'\x1b\[[0-9;?]*[ -/]*[@-~]')
+'''
+ANSI CSI escape sequence (colors, glosses, erase, ...)
+
+'''
+
+_TOKEN = re.compile(r'(\x1b\[[0-9;?]*[ -/]*[@-~])|(\n)|([ \t]+)'
+                    r'|([^\s\x1b]+|\x1b)')
+_COLUMNS: List[Optional[int]] = [None]
+_HOOKED: List[bool] = [False]
+
+
+def strip_ansi(text: str) -> str:
+    '''
+    ``text`` without ANSI escape sequences
+    '''
+    if '\x1b' not in text:
+        return text
+    return ESCAPE.sub('', text)
+
+
+@lru_cache(maxsize=4096)
+def char_width(char: str) -> int:
+    '''
+    Terminal columns taken by ``char``
+
+    Returns:
+        0 for combining characters, 2 for wide and full-width East Asian
+        characters, else 1
+
+    '''
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+
+
+def visible_width(text: str) -> int:
+    '''
+    Terminal columns taken by ``text``, ignoring ANSI escape sequences
+
+    ASCII text is measured by ``len``; other text character by character.
+
+    Args:
+        text: single line of text
+
+    '''
+    text = strip_ansi(text)
+    if text.isascii():
+        return len(text)
+    return sum(map(char_width, text))
+
+
+def _split(word: str, start: int, room: int) -> int:
+    '''
+    Number of characters of (non-ASCII) ``word`` from ``start`` that fit
+    in ``room`` columns
+    '''
+    used = 0
+    for count in range(len(word) - start):
+        used += char_width(word[start + count])
+        if used > room:
+            return count
+    return len(word) - start
+
+
+def wrap(text: str, indent: int, width: int, newline: str = None) -> str:
+    '''
+    Wrap ``text`` at ``width`` columns with a hanging indent
+
+    ``text`` starts ``indent`` columns in (after a prefix); every
+    continuation line is indented by as many spaces. Escape sequences
+    take no room and are never split; words longer than a line are
+    broken. Runs in a single pass over ``text``.
+
+    Args:
+        text: text after the prefix
+        indent: visible width of the prefix
+        width: columns of the terminal
+        newline: starts continuation lines (default: newline and
+            ``indent`` spaces)
+
+    Returns:
+        wrapped text (without the prefix)
+
+    '''
+    room = width - indent
+    if room < 1:
+        return text
+    if newline is None:
+        newline = '\n' + ' ' * indent
+    out: List[str] = []
+    col = 0
+    space = ''
+    for match in _TOKEN.finditer(text):
+        group = match.lastindex
+        token = match.group(group)
+        if group == 1:
+            out.append(token)
+        elif group == 2:
+            out.append(newline)
+            col = 0
+            space = ''
+        elif group == 3:
+            space = token
+        else:
+            if space:
+                if '\t' in space:
+                    span = 0
+                    for char in space:
+                        span += 8 - (indent + col + span) % 8 \
+                            if char == '\t' else 1
+                else:
+                    span = len(space)
+            else:
+                span = 0
+            span_word = visible_width(token)
+            if col and col + span + span_word > room:
+                out.append(newline)
+                col = 0
+            elif space:
+                out.append(space)
+                col += span
+            space = ''
+            start = 0
+            ascii = token.isascii()
+            while col + span_word > room:
+                cut = room - col if ascii else _split(token, start, room - col)
+                if not cut and not col:
+                    cut = 1  # wider than a line: emit anyway
+                piece = token[start:start + cut]
+                out.append(piece)
+                out.append(newline)
+                span_word -= visible_width(piece)
+                start += cut
+                col = 0
+            out.append(token[start:] if start else token)
+            col += span_word
+    out.append(space)
+    return ''.join(out)
+
+
+def _resized(signum, frame, previous=None) -> None:
+    '''
+    ``SIGWINCH`` handler: forget the cached terminal width
+    '''
+    _COLUMNS[0] = None
+    if callable(previous):
+        previous(signum, frame)
+
+
+def terminal_width() -> int:
+    '''
+    Columns of the terminal
+
+    ``shutil.get_terminal_size`` is called once and again only after the
+    terminal is resized (``SIGWINCH``, where available and when first
+    called from the main thread).
+
+    '''
+    columns = _COLUMNS[0]
+    if columns is not None:
+        return columns
+    if not _HOOKED[0] and hasattr(signal, 'SIGWINCH') and \
+       threading.current_thread() is threading.main_thread():
+        previous = signal.getsignal(signal.SIGWINCH)
+        signal.signal(
+            signal.SIGWINCH,
+            lambda signum, frame: _resized(signum, frame, previous))
+        _HOOKED[0] = True
+    columns = shutil.get_terminal_size().columns
+    if _HOOKED[0]:
+        # without a hook, the size is never refreshed: don't cache
+        _COLUMNS[0] = columns
+    return columns
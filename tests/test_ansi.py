@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test extended colors
+'''
+
+import unittest
+
+from psprint.ansi import ANSI, color_depth, extended_color, nearest_palette
+from psprint.text_types import AnsiEffect
+
+
+class TestDepth(unittest.TestCase):
+    def test_detect(self):
+        self.assertEqual(color_depth({'COLORTERM': 'truecolor'}), 24)
+        self.assertEqual(color_depth({'TERM': 'xterm-256color'}), 8)
+        self.assertEqual(color_depth({'TERM': 'linux'}), 4)
+
+
+class TestExtended(unittest.TestCase):
+    def test_truecolor(self):
+        self.assertEqual(extended_color('#ff8800', depth=24),
+                         '\x1b[38;2;255;136;0m')
+        self.assertEqual(extended_color('#f80', background=True, depth=24),
+                         '\x1b[48;2;255;136;0m')
+
+    def test_palette(self):
+        self.assertEqual(extended_color(208, depth=24), '\x1b[38;5;208m')
+        self.assertEqual(extended_color('#ff8700', depth=8),
+                         '\x1b[38;5;208m')
+        self.assertEqual(nearest_palette((128, 128, 128)), 244)
+
+    def test_basic(self):
+        self.assertEqual(extended_color('#ff0000', depth=4),
+                         ANSI.FG_COLORS[9])
+        self.assertEqual(extended_color(196, background=True, depth=4),
+                         ANSI.BG_COLORS[9])
+
+    def test_bad(self):
+        for color in (16, 256, '#12', 'ff8800', True):
+            self.assertRaises(ValueError, extended_color, color)
+
+    def test_effect(self):
+        effect = AnsiEffect(color='#ff8800', bgcol=17)
+        self.assertEqual(effect.color, extended_color('#ff8800'))
+        self.assertEqual(effect.bgcol, extended_color(17, background=True))
+        # basic names are untouched
+        self.assertEqual(AnsiEffect(color='red').color, ANSI.FG_COLORS['r'])
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test flush policy
+'''
+
+import io
+import time
+import unittest
+from pathlib import Path
+
+from psprint.flusher import Flusher
+from psprint.printer import PrintSpace
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class CountingIO(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestFlusher(unittest.TestCase):
+    def test_latency(self):
+        stream = CountingIO()
+        flusher = Flusher(latency=0.05, threshold=1000)
+        flusher.wrote(stream, 10)
+        flusher.wrote(stream, 10)
+        self.assertEqual(stream.flushes, 0)
+        time.sleep(0.2)
+        self.assertEqual(stream.flushes, 1)
+
+    def test_threshold(self):
+        stream = CountingIO()
+        flusher = Flusher(latency=60, threshold=15)
+        flusher.wrote(stream, 10)
+        self.assertEqual(stream.flushes, 0)
+        flusher.wrote(stream, 10)
+        self.assertEqual(stream.flushes, 1)
+
+
+class TestPolicy(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.stream = CountingIO()
+        self.space.print_kwargs['file'] = self.stream
+        self.space.flusher = Flusher(latency=60)
+
+    def test_per_mark(self):
+        self.space.psprint('coalesced', mark='info')
+        self.assertEqual(self.stream.flushes, 0)
+        self.space.psprint('immediate', mark='err')
+        self.assertEqual(self.stream.flushes, 1)
+        self.space.flush()
+        self.assertEqual(self.stream.flushes, 3)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test output size guard
+'''
+
+import io
+import json
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from psprint.guard import elide
+from psprint.printer import PrintSpace
+from psprint.sinks import JSONSink
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+TEXT = '\n'.join(f'line {num}' for num in range(10))
+
+
+class TestElide(unittest.TestCase):
+    def test_within(self):
+        arg = 'short'
+        self.assertIs(elide(arg, max_len=10, max_lines=2), arg)
+        self.assertEqual(elide(42, max_len=10), '42')
+
+    def test_len(self):
+        self.assertEqual(elide('a' * 10 + 'b' * 10, max_len=4),
+                         'aa ... 16 characters elided ... bb')
+
+    def test_lines(self):
+        self.assertEqual(elide(TEXT, max_lines=4),
+                         'line 0\nline 1\n... 6 lines elided ...\n'
+                         'line 8\nline 9')
+        self.assertEqual(elide(TEXT + '\n', max_lines=2),
+                         'line 0\n... 8 lines elided ...\nline 9\n')
+
+    def test_bytes(self):
+        self.assertEqual(elide(b'0123456789', max_len=4),
+                         "b'01' ... 6 bytes elided ... b'89'")
+
+    def test_no_copy(self):
+        arg = 'x' * (16 << 20)
+        tracemalloc.start()
+        try:
+            elide(arg, max_len=100, max_lines=10)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1 << 20)
+
+    def test_container(self):
+        arg = list(range(1 << 20))
+        tracemalloc.start()
+        try:
+            text = elide(arg, max_len=20)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1 << 20)
+        self.assertTrue(text.startswith('[0, 1, 2'))
+        self.assertTrue(text.endswith(f'{(1 << 20) - 1}]'))
+        self.assertEqual(elide([1, 2], max_len=20), '[1, 2]')
+
+    def test_items(self):
+        self.assertEqual(elide(list(range(100)), max_len=20),
+                         '[0, 1, 2, 3, ... 93 items elided ..., 97, 98, 99]')
+        word = 'x' * 40
+        self.assertEqual(elide([word] * 5, max_len=4),
+                         f"['{word}', ... 3 items elided ..., '{word}']")
+        self.assertEqual(elide({num: num for num in range(9)}, max_len=4),
+                         '{0: 0, ... 7 items elided ..., 8: 8}')
+
+
+class TestMark(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.switches['bland'] = True
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_on_the_fly(self):
+        self.space.psprint('a' * 10 + 'b' * 10, mark='info', max_len=4)
+        self.assertEqual(self.stream.getvalue(),
+                         '[INFORM]aa ... 16 characters elided ... bb\n')
+
+    def test_config(self):
+        self.space.edit_style(pref='HUGE', mark='huge', max_lines=2)
+        self.space.psprint(TEXT, mark='huge')
+        self.assertEqual(self.stream.getvalue(),
+                         '[HUGE]line 0\n... 8 lines elided ...\nline 9\n')
+
+    def test_json_sink(self):
+        self.space.add_sink('json', JSONSink(self.stream))
+        self.space.psprint('a' * 10 + 'b' * 10, mark='info', max_len=4)
+        self.assertEqual(
+            json.loads(self.stream.getvalue())['text'],
+            'aa ... 16 characters elided ... bb')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test history
+'''
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+from psprint.history import History
+from psprint.printer import PrintSpace
+from psprint.throttle import Collapser
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestHistory(unittest.TestCase):
+    def test_ring(self):
+        history = History(3)
+        for num in range(5):
+            history.push('m', (num, ))
+        self.assertEqual([record[1] for record in history.records()],
+                         [(2, ), (3, ), (4, )])
+        history.clear()
+        self.assertEqual(list(history.records()), [])
+
+    def test_partial(self):
+        history = History(4)
+        history.push('m', ('only', ), 'here.py:1:main')
+        (record, ) = history.records()
+        self.assertEqual(record[:2], ('m', ('only', )))
+        self.assertIsInstance(record[2], float)
+        self.assertEqual(record[3], 'here.py:1:main')
+
+
+class TestDump(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.out = io.StringIO()
+        self.space.print_kwargs['file'] = self.out
+        self.space.switches['bland'] = True
+        self.space.history = History(2)
+        self.space.edit_style(pref='DEBUG', mark='bug', mute=True)
+
+    def test_dump_on_err(self):
+        for num in range(3):
+            self.space.psprint(f'hidden {num}', mark='bug')
+        self.space.psprint('shown', mark='info')
+        self.assertEqual(self.out.getvalue(), '[INFORM]shown\n')
+        self.space.psprint('failed', mark='err')
+        self.assertEqual(self.out.getvalue().splitlines()[1:],
+                         ['[DEBUG]hidden 2', '[ERROR]failed'])
+
+    def test_dump_collapsed(self):
+        self.space.history = History(8)
+        self.space.collapse = Collapser()
+        self.space.psprint('dbg', mark='bug')
+        for _ in range(3):
+            self.space.psprint('same', mark='info')
+        self.space.psprint('failed', mark='err')
+        self.assertEqual(self.out.getvalue().splitlines(), [
+            '[INFORM]same',
+            '[INFORM]last message repeated 2 times',
+            '[DEBUG]dbg',
+            '[ERROR]failed',
+        ])
+
+    def test_dump_everything(self):
+        self.space.psprint('hidden', mark='bug')
+        self.space.psprint('shown', mark='info')
+        self.space.dump_history(everything=True)
+        self.assertEqual(self.out.getvalue().splitlines(),
+                         ['[INFORM]shown', '[DEBUG]hidden', '[INFORM]shown'])
+
+    def test_dump_as_called(self):
+        stamps = []
+        self.space.stamp = lambda now=None: stamps.append(now) or 'T'
+        self.space.edit_style(pref='DEBUG', mark='bug', mute=True,
+                              locate=True)
+        self.space.psprint('hidden', mark='bug')
+        line = sys._getframe().f_lineno - 1
+        self.space.dump_history()
+        self.assertIsInstance(stamps[-1], float)
+        self.assertIn(f'test_history.py:{line}:test_dump_as_called',
+                      self.out.getvalue())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test per-line prefixing
+'''
+
+import io
+import unittest
+from pathlib import Path
+
+from psprint.printer import PrintSpace
+from psprint.sinks import Sink
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestLinesSwitch(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.switches['bland'] = True
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_first(self):
+        self.space.psprint('one\ntwo', mark='err')
+        self.assertEqual(self.stream.getvalue(), '[ERROR]one\ntwo\n')
+
+    def test_each(self):
+        self.space.psprint('one\ntwo\n', mark='err', lines='each')
+        self.assertEqual(self.stream.getvalue(),
+                         '[ERROR]one\n[ERROR]two\n\n')
+
+    def test_indent(self):
+        self.space.psprint('one\ntwo', mark='err', lines='indent')
+        self.assertEqual(self.stream.getvalue(), '[ERROR]one\n       two\n')
+
+    def test_styled(self):
+        text = self.space.psfmt('one\ntwo',
+                                mark='err',
+                                lines='each',
+                                bland=False,
+                                sep=' ')
+        mark = self.space.info_style['err']
+        self.assertEqual(text.count(mark.pref.to_str() + str(mark.text)), 2)
+
+    def test_list_form(self):
+        self.assertEqual(self.space.psfmt('a\nb', mark='err', lines='each'),
+                         ['[ERROR]a\n[ERROR]b'])
+
+    def test_wrapped(self):
+        self.space.wrap_width = 16
+        self.space.psprint('one two three',
+                           mark='err',
+                           lines='each',
+                           wrap=True)
+        self.assertEqual(self.stream.getvalue(),
+                         '[ERROR]one two\n[ERROR]three\n')
+
+
+class TestPsprintLines(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.switches['bland'] = True
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_generator(self):
+        self.space.psprint_lines((f'line {num}' for num in range(3)),
+                                 mark='info',
+                                 batch=2)
+        self.assertEqual(self.stream.getvalue(), ''.join(
+            f'[INFORM]line {num}\n' for num in range(3)))
+
+    def test_file(self):
+        source = io.StringIO('Traceback\n  File "x"\nError\n')
+        self.space.psprint_lines(source, mark='err', lines='indent')
+        self.assertEqual(
+            self.stream.getvalue(),
+            '[ERROR]Traceback\n         File "x"\n       Error\n')
+
+    def test_string(self):
+        self.space.psprint_lines('a\nb', mark='err')
+        self.assertEqual(self.stream.getvalue(), '[ERROR]a\n[ERROR]b\n')
+
+    def test_empty(self):
+        self.space.psprint_lines([], mark='err', lines='indent')
+        self.assertEqual(self.stream.getvalue(), '')
+
+    def test_stamped(self):
+        self.space.stamp = lambda now=None: 'T'
+        self.space.psprint_lines('a\nb', mark='err')
+        self.assertEqual(self.stream.getvalue(), 'T [ERROR]a\nT [ERROR]b\n')
+
+    def test_routed(self):
+        routed = io.StringIO()
+        self.space.add_sink('log', Sink(routed))
+        self.space.edit_style(pref='ERROR', mark='err', sink='log')
+        self.space.psprint_lines((f'line {num}' for num in range(3)),
+                                 mark='err',
+                                 batch=2)
+        self.assertEqual(self.stream.getvalue(), '')
+        self.assertEqual(routed.getvalue(), ''.join(
+            f'[ERROR]line {num}\n' for num in range(3)))
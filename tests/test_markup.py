@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test inline markup
+'''
+
+import io
+import unittest
+from pathlib import Path
+
+from psprint.ansi import ANSI
+from psprint.markup import render_markup, render_template
+from psprint.printer import PrintSpace
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+GREEN, RED = ANSI.FG_COLORS['g'], ANSI.FG_COLORS['r']
+
+
+class TestMarkup(unittest.TestCase):
+    def test_styled(self):
+        self.assertEqual(
+            render_markup('done [g]42[/] items', '<base>'),
+            'done ' + GREEN + '42' + ANSI.RESET_ALL + '<base> items')
+
+    def test_nested(self):
+        self.assertEqual(
+            render_markup('[on r][dim]x[/]y[/]', ''),
+            ANSI.BG_COLORS['r'] + ANSI.GLOSS['d'] + 'x' + ANSI.RESET_ALL +
+            ANSI.BG_COLORS['r'] + 'y' + ANSI.RESET_ALL)
+
+    def test_bland(self):
+        self.assertEqual(render_markup('done [g]42[/] items'),
+                         'done 42 items')
+
+    def test_unknown(self):
+        self.assertEqual(render_markup('[x] list [/] [1]'),
+                         '[x] list [/] [1]')
+
+    def test_cached(self):
+        render_template.cache_clear()
+        for _ in range(3):
+            render_template('[r]cached[/]', '')
+        self.assertEqual(render_template.cache_info().hits, 2)
+
+    def test_switch_uncached(self):
+        render_template.cache_clear()
+        space = PrintSpace(config=STYLE)
+        for num in range(3):
+            space.psprint(f'[r]{num}[/]', mark='info', markup=True,
+                          file=io.StringIO())
+        self.assertEqual(render_template.cache_info().currsize, 0)
+
+
+class TestPrint(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_switch(self):
+        self.space.psprint('[g]ok[/] [x]', mark='info', markup=True,
+                           bland=True)
+        self.space.psprint('[g]ok[/]', mark='info', bland=True)
+        self.assertEqual(self.stream.getvalue(),
+                         '[INFORM]ok [x]\n[INFORM][g]ok[/]\n')
+
+    def test_psprintf(self):
+        self.space.psprintf('done [g]{}[/] items, [r]{}[/] failed',
+                            42,
+                            '[g]',
+                            mark='info',
+                            bland=True,
+                            markup=True)
+        self.assertEqual(self.stream.getvalue(),
+                         '[INFORM]done 42 items, [g] failed\n')
+
+    def test_psprintf_styled(self):
+        self.space.psprintf('[r]{}[/]', 3, mark='info', pad=False)
+        text = str(self.space.info_style['info'].text)
+        self.assertIn(RED + '3' + ANSI.RESET_ALL + text,
+                      self.stream.getvalue())
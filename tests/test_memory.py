@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test allocations and peak memory
+
+Bulk workloads are scaled down by default; set ``PSPRINT_BULK_LINES``
+(e.g. 1000000) and ``PSPRINT_BULK_BYTES`` (e.g. 100000000) to run them
+at full size.
+'''
+
+import gc
+import os
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from psprint.printer import PrintSpace
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+BULK_LINES = int(os.environ.get('PSPRINT_BULK_LINES', 20000))
+BULK_BYTES = int(os.environ.get('PSPRINT_BULK_BYTES', 8 << 20))
+
+# budgets [bytes]: about twice what a call needs today
+PEAK_PER_CALL = 3 << 10
+PEAK_PER_CALL_KWARGS = 8 << 10
+PEAK_BULK_LINES = 64 << 10
+PEAK_BULK_FACTOR = 2.5  # times the size of the argument
+RETAINED = 1 << 10  # after all calls, however many
+
+
+class NullIO():
+    '''
+    Discard everything (``os.devnull`` buffers pending text)
+    '''
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def measure(call, repeat=2000, warmup=100):
+    '''
+    Peak memory of one ``call`` and memory retained by ``repeat`` calls
+    '''
+    for _ in range(warmup):
+        call()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        for _ in range(repeat):
+            call()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+@unittest.skipUnless(hasattr(tracemalloc, 'reset_peak'),
+                     'tracemalloc.reset_peak needs python >= 3.9')
+class TestPerCall(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.print_kwargs['file'] = NullIO()
+
+    def check(self, call, peak_budget=PEAK_PER_CALL):
+        peak, retained = measure(call)
+        self.assertLess(peak, peak_budget)
+        self.assertLess(retained, RETAINED)
+
+    def test_psfmt(self):
+        self.check(lambda: self.space.psfmt('hello', 'world', mark='info'))
+
+    def test_psprint(self):
+        self.check(lambda: self.space.psprint('hello', 'world', mark='info'))
+
+    def test_bound(self):
+        self.check(lambda: self.space.info('hello', 'world'))
+
+    def test_on_the_fly(self):
+        self.check(
+            lambda: self.space.psprint('hello', mark='info', text_color='r'),
+            PEAK_PER_CALL_KWARGS)
+
+    def test_bland(self):
+        self.check(lambda: self.space.psprint('hello', mark='info',
+                                              bland=True))
+
+    def test_disabled(self):
+        self.check(lambda: self.space.psprint('hello', mark='info',
+                                              disabled=True))
+
+
+@unittest.skipUnless(hasattr(tracemalloc, 'reset_peak'),
+                     'tracemalloc.reset_peak needs python >= 3.9')
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.print_kwargs['file'] = NullIO()
+
+    def test_lines(self):
+        def lines():
+            for num in range(BULK_LINES):
+                self.space.info('line', num)
+
+        peak, retained = measure(lines, repeat=0, warmup=0)
+        self.assertLess(peak, PEAK_BULK_LINES)
+        self.assertLess(retained, RETAINED)
+
+    def test_large_arg(self):
+        arg = 'x' * BULK_BYTES
+        peak, retained = measure(lambda: self.space.info(arg),
+                                 repeat=1,
+                                 warmup=1)
+        self.assertLess(peak, PEAK_BULK_FACTOR * BULK_BYTES)
+        self.assertLess(retained, RETAINED)
@@ -21,7 +21,9 @@
 test print
 '''
 
+import io
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -165,10 +167,13 @@ class TextErrors(unittest.TestCase):
         """
         self.assertRaises(
             errors.BadColor,
-            lambda: DEFAULT_PRINT.psprint("bad color", pref_color=77))
+            lambda: DEFAULT_PRINT.psprint("bad color", pref_color=256))
+        self.assertRaises(
+            errors.BadColor,
+            lambda: DEFAULT_PRINT.psprint("bad color", pref_color='#12345'))
         self.assertRaises(
             errors.BadBGCol,
-            lambda: DEFAULT_PRINT.psprint("bad color", pref_bgcol=77))
+            lambda: DEFAULT_PRINT.psprint("bad color", pref_bgcol=256))
         self.assertRaises(
             errors.BadGloss,
             lambda: DEFAULT_PRINT.psprint("bad gloss", pref_gloss=77))
@@ -211,3 +216,67 @@ class TextErrors(unittest.TestCase):
         '''
         self.assertRaises(errors.BadMark,
                           lambda: DEFAULT_PRINT.psprint("bad mark", mark=[]))
+
+
+class TestScope(unittest.TestCase):
+    def setUp(self):
+        self.out = io.StringIO()
+
+    def test_scoped(self):
+        with DEFAULT_PRINT.scope(mark='err',
+                                 bland=True,
+                                 pad=False,
+                                 short=False,
+                                 file=self.out):
+            DEFAULT_PRINT.psprint('scoped')
+            DEFAULT_PRINT.psprint('info', mark='info')
+            DEFAULT_PRINT.psprint('short', short=True)
+            with DEFAULT_PRINT.scope(pad=True):
+                DEFAULT_PRINT.psprint('nested')
+            self.assertEqual(DEFAULT_PRINT.psfmt('fmt', sep=''), '[ERROR]fmt')
+        self.assertIsNone(DEFAULT_PRINT._scope.get())
+        self.assertEqual(
+            self.out.getvalue().splitlines(),
+            ['[ERROR]scoped', '[INFORM]info', '[!]short', '[ERROR]   nested'])
+
+    def test_thread_local(self):
+        seen = []
+
+        def other():
+            seen.append(DEFAULT_PRINT.psfmt('x', bland=True, short=False,
+                                            pad=False, sep=''))
+
+        with DEFAULT_PRINT.scope(mark='err'):
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, ['x'])
+
+
+class TestBound(unittest.TestCase):
+    def setUp(self):
+        self.out = io.StringIO()
+
+    def test_bound(self):
+        with DEFAULT_PRINT.scope(bland=True,
+                                 pad=False,
+                                 short=False,
+                                 file=self.out):
+            DEFAULT_PRINT.err('bound')
+            DEFAULT_PRINT.info('bound', short=True)
+        self.assertEqual(self.out.getvalue().splitlines(),
+                         ['[ERROR]bound', '[i]bound'])
+
+    def test_regenerate(self):
+        DEFAULT_PRINT.edit_style(pref='BOUND', mark='bound')
+        DEFAULT_PRINT.bound('new', file=self.out, bland=True, pad=False,
+                            short=False)
+        DEFAULT_PRINT.remove_style(mark='bound')
+        self.assertFalse(hasattr(DEFAULT_PRINT, 'bound'))
+        self.assertNotIn('bound', DEFAULT_PRINT.info_index)
+        self.assertEqual(self.out.getvalue(), '[BOUND]new\n')
+
+    def test_no_clash(self):
+        DEFAULT_PRINT.edit_style(pref='CLASH', mark='psfmt')
+        self.assertTrue(callable(DEFAULT_PRINT.psfmt('x', sep='').upper))
+        DEFAULT_PRINT.remove_style(mark='psfmt')
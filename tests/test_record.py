@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test binary records
+'''
+
+import io
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from psprint import DEFAULT_PRINT, errors
+from psprint.printer import PrintSpace
+from psprint.record import RecordSink, read_records, render
+from psprint.stamps import TimeStamp
+from psprint.throttle import Collapser
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestRecord(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name).joinpath('log.psr')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            sink.record('first', 2, mark='err')
+            sink('second')
+            sink('third', mark=DEFAULT_PRINT.info_index.index('list'))
+        records = list(read_records(self.path))
+        self.assertEqual([rec[0] for rec in records], ['err', 'cont', 'list'])
+        self.assertEqual(records[0][2], ['first', '2'])
+
+    def test_append_sessions(self):
+        for _ in range(2):
+            with RecordSink(self.path, DEFAULT_PRINT) as sink:
+                sink('again', mark='info')
+        self.assertEqual(len(list(read_records(self.path))), 2)
+
+    def test_truncated(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            sink('complete', mark='info')
+            sink('truncated', mark='info')
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-3])
+        self.assertEqual(len(list(read_records(self.path))), 1)
+
+    def test_render(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            sink('rendered', mark='err')
+        out = io.StringIO()
+        self.assertEqual(render(self.path, DEFAULT_PRINT, file=out,
+                                bland=True, pad=False, short=False), 1)
+        self.assertEqual(out.getvalue(), '[ERROR]rendered\n')
+
+    def test_render_replays(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            for _ in range(3):
+                sink('again', mark='err')
+        space = PrintSpace(config=STYLE)
+        space.collapse = Collapser()
+        out = io.StringIO()
+        self.assertEqual(render(self.path, space, file=out, bland=True), 3)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+    def test_render_time(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            sink('stamped', mark='err')
+        space = PrintSpace(config=STYLE)
+        space.stamp = TimeStamp('%Y-%m-%d %H:%M:%S', 0)
+        ((_, when, _), ) = read_records(self.path)
+        out = io.StringIO()
+        with mock.patch('time.time', return_value=0.):
+            render(self.path, space, file=out, bland=True)
+        self.assertTrue(out.getvalue().startswith(space.stamp(when) + ' '))
+
+    def test_index_range(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            sink('far', mark=40000)
+            sink('negative', mark=-1)
+        self.assertEqual([mark for mark, _, _ in read_records(self.path)],
+                         [DEFAULT_PRINT.info_index[0]] * 2)
+
+    def test_bad_mark(self):
+        with RecordSink(self.path, DEFAULT_PRINT) as sink:
+            self.assertRaises(errors.BadMark, lambda: sink('bad', mark=[]))
+
+    def test_not_record(self):
+        self.path.write_bytes(b'plain text\n')
+        self.assertRaises(ValueError, lambda: list(read_records(self.path)))
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test sinks
+'''
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from psprint import errors
+from psprint.printer import PrintSpace
+from psprint.sinks import (CompressedSink, FileSink, JSONSink, RingSink,
+                           Sink, read_ring)
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_variants(self):
+        streams = [io.StringIO() for _ in range(4)]
+        self.space.add_sink('term', Sink(streams[0]))
+        self.space.add_sink('log', Sink(streams[1], bland=True))
+        self.space.add_sink('log2', Sink(streams[2], bland=True))
+        self.space.add_sink('json', JSONSink(streams[3]))
+        renders = []
+        render = Sink.render
+
+        def counted(sink, *args, **kwargs):
+            renders.append(sink)
+            return render(sink, *args, **kwargs)
+
+        Sink.render = counted
+        try:
+            self.space.psprint('fan', 'out', mark='err')
+        finally:
+            Sink.render = render
+        self.assertEqual(len(renders), 2)
+        self.assertIn('\x1b[', streams[0].getvalue())
+        self.assertEqual(streams[1].getvalue(), '[ERROR]fan\tout\n')
+        self.assertEqual(streams[2].getvalue(), streams[1].getvalue())
+        record = json.loads(streams[3].getvalue())
+        self.assertEqual((record['mark'], record['text']),
+                         ('ERROR', 'fan\tout'))
+
+    def test_explicit_file(self):
+        sink = io.StringIO()
+        direct = io.StringIO()
+        self.space.add_sink('sink', Sink(sink))
+        self.space.psprint('direct', file=direct, bland=True)
+        self.assertEqual((sink.getvalue(), direct.getvalue()),
+                         ("", "direct\n"))
+
+    def test_print_defaults(self):
+        text, data = io.StringIO(), io.StringIO()
+        self.space.add_sink('text', Sink(text, bland=True))
+        self.space.add_sink('json', JSONSink(data))
+        self.space.psprint('a', 'b', mark='info', sep=None, end=None)
+        self.assertEqual(text.getvalue(), '[INFORM]a b\n')
+        self.assertEqual(json.loads(data.getvalue())['text'], 'a b')
+
+    def test_config(self):
+        log = Path(self.tmpdir.name).joinpath('out.log')
+        config = Path(self.tmpdir.name).joinpath('style.yml')
+        config.write_text('\n'.join([
+            'sinks:',
+            '  log:',
+            f'    file: {log}',
+            '    bland: true',
+            '',
+        ]))
+        self.space.set_opts(config)
+        self.space.psprint('configured', mark='info')
+        self.space.remove_sink('log').close()
+        self.assertEqual(log.read_text(), '[INFORM]configured\n')
+
+    def test_bad_config(self):
+        config = Path(self.tmpdir.name).joinpath('style.yml')
+        config.write_text('sinks:\n  bad:\n    kind: nonesuch\n')
+        self.assertRaises(errors.BadSink, lambda: self.space.set_opts(config))
+
+
+class TestFileSink(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name).joinpath('run.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_buffered(self):
+        sink = FileSink(self.path, buffer_size=1 << 12)
+        sink.write('buffered\n')
+        self.assertEqual(self.path.read_text(), '')
+        sink.flush()
+        self.assertEqual(self.path.read_text(), 'buffered\n')
+        sink.close()
+
+    def test_rotate(self):
+        sink = FileSink(self.path, max_bytes=10, backups=2)
+        for num in range(4):
+            sink.write(f'line {num:04d}\n')
+        sink.close()
+        self.assertEqual(self.path.read_text(), '')
+        self.assertEqual(
+            Path(f'{self.path}.1').read_text(), 'line 0003\n')
+        self.assertEqual(
+            Path(f'{self.path}.2').read_text(), 'line 0002\n')
+        self.assertFalse(Path(f'{self.path}.3').exists())
+
+    def test_append(self):
+        self.path.write_text('old\n')
+        sink = FileSink(self.path, max_bytes=8, backups=1)
+        sink.write('new\n')
+        sink.close()
+        self.assertEqual(Path(f'{self.path}.1').read_text(), 'old\nnew\n')
+
+    def test_config(self):
+        config = Path(self.tmpdir.name).joinpath('style.yml')
+        config.write_text('\n'.join([
+            'sinks:',
+            '  log:',
+            '    kind: file',
+            f'    file: {self.path}',
+            '    max_bytes: 1000000',
+            '    bland: true',
+            '',
+        ]))
+        space = PrintSpace(config=STYLE)
+        space.set_opts(config)
+        self.assertIsInstance(space.sinks['log'], FileSink)
+        space.psprint('rotating', mark='act')
+        space.flush()
+        self.assertEqual(self.path.read_text(), '[ACTION]rotating\n')
+        space.sinks['log'].close()
+
+
+class TestCompressedSink(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_methods(self):
+        for method, opener in (('gzip', gzip.open), ('bz2', bz2.open),
+                               ('lzma', lzma.open)):
+            path = Path(self.tmpdir.name).joinpath(f'run.{method}')
+            sink = CompressedSink(path, method=method, batch=16)
+            for num in range(100):
+                sink.write(f'line {num}\n')
+            sink.flush()
+            with opener(path, 'rt') as stream:
+                self.assertEqual(len(stream.readlines()), 100)
+            sink.write('last\n')
+            sink.close()
+            with opener(path, 'rt') as stream:
+                self.assertEqual(stream.readlines()[-1], 'last\n')
+
+    def test_idle_sync(self):
+        path = Path(self.tmpdir.name).joinpath('idle.gz')
+        sink = CompressedSink(path, sync_every=0.05)
+        for num in range(10):
+            sink.write(f'line {num}\n')
+        time.sleep(0.5)
+        # not flushed, not closed: readable after the idle sync
+        with gzip.open(path, 'rt') as stream:
+            self.assertEqual(len(stream.readlines()), 10)
+        sink.close()
+
+    def test_bland_default(self):
+        path = Path(self.tmpdir.name).joinpath('run.gz')
+        space = PrintSpace(config=STYLE)
+        space.add_sink('archive', CompressedSink(path))
+        space.psprint('archived', mark='err', pad=False, short=False)
+        space.sinks['archive'].close()
+        with gzip.open(path, 'rt') as stream:
+            self.assertEqual(stream.read(), '[ERROR]archived\n')
+
+    def test_flush_publishes(self):
+        path = Path(self.tmpdir.name).joinpath('run.gz')
+        space = PrintSpace(config=STYLE)
+        sink = CompressedSink(path)
+        space.add_sink('archive', sink)
+        with mock.patch.object(sink, 'flush', wraps=sink.flush) as flush:
+            for num in range(10):
+                space.psprint(f'line {num}', mark='err', flush=True)
+            flush.assert_not_called()
+            space.flush()
+            flush.assert_called_once_with()
+        with gzip.open(path, 'rt') as stream:
+            self.assertEqual(len(stream.readlines()), 10)
+        sink.close()
+
+
+class TestRingSink(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name).joinpath('black.box')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_no_wrap(self):
+        sink = RingSink(self.path, size=64)
+        sink.write('first\n')
+        sink.write('second\n')
+        self.assertEqual(read_ring(self.path), b'first\nsecond\n')
+        sink.close()
+
+    def test_wrap(self):
+        sink = RingSink(self.path, size=32)
+        for num in range(20):
+            sink.write(f'line {num:02d}\n')
+        sink.close()
+        self.assertEqual(read_ring(self.path),
+                         b'line 17\nline 18\nline 19\n')
+
+    def test_oversized(self):
+        sink = RingSink(self.path, size=16)
+        sink.write('x' * 40 + '\nlast line\n')
+        sink.close()
+        self.assertEqual(read_ring(self.path), b'last line\n')
+
+    def test_reopen(self):
+        sink = RingSink(self.path, size=64)
+        sink.write('before\n')
+        sink.close()
+        sink = RingSink(self.path, size=64)
+        sink.write('after\n')
+        sink.close()
+        self.assertEqual(read_ring(self.path), b'before\nafter\n')
+        RingSink(self.path, size=128).close()
+        self.assertEqual(read_ring(self.path), b'')
+
+    def test_flush_publishes(self):
+        space = PrintSpace(config=STYLE)
+        sink = RingSink(self.path, size=64)
+        space.add_sink('box', sink)
+        with mock.patch.object(sink, 'flush') as msync:
+            space.psprint('visible', mark='err', flush=True, bland=True,
+                          pad=False, short=False)
+            msync.assert_not_called()
+            self.assertEqual(read_ring(self.path), b'[ERROR]visible\n')
+        sink.close()
+
+
+class TestRouting(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.switches['bland'] = True
+        self.out = io.StringIO()
+        self.space.print_kwargs['file'] = self.out
+
+    def test_std_route(self):
+        self.space.edit_style(pref='ERROR', mark='err', sink='stderr')
+        errors_out = io.StringIO()
+        stderr, sys.stderr = sys.stderr, errors_out
+        try:
+            self.space.psprint('to stderr', mark='err')
+            self.space.err('bound to stderr')
+            self.space.psprint('to stdout', mark='info')
+        finally:
+            sys.stderr = stderr
+        self.assertEqual(errors_out.getvalue(),
+                         '[ERROR]to stderr\n[ERROR]bound to stderr\n')
+        self.assertEqual(self.out.getvalue(), '[INFORM]to stdout\n')
+
+    def test_named_route(self):
+        audit = io.StringIO()
+        self.space.edit_style(pref='AUDIT', mark='audit', sink=['audit'])
+        self.space.add_sink('audit', Sink(audit))
+        self.space.psprint('audited', mark='audit')
+        self.space.psprint('derived', mark='audit', pref_color='r')
+        self.assertEqual(audit.getvalue(), '[AUDIT]audited\n[AUDIT]derived\n')
+
+    def test_unknown_route(self):
+        config = Path(tempfile.mkstemp()[1])
+        config.write_text('lost:\n  pref: LOST\n  sink: nowhere\n')
+        self.assertWarns(errors.KeyWarning,
+                         lambda: self.space.set_opts(config))
+        config.unlink()
+        self.space.psprint('default', mark='lost')
+        self.assertEqual(self.out.getvalue(), '[LOST]default\n')
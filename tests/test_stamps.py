@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test stamps
+'''
+
+import sys
+import time
+import unittest
+
+from psprint import DEFAULT_PRINT
+from psprint.mark_types import InfoMark
+from psprint.stamps import TimeStamp, locate
+from psprint.viewer import LogIndex
+
+
+class TestTimeStamp(unittest.TestCase):
+    def test_format(self):
+        stamp = TimeStamp('%H:%M:%S', digits=3)
+        now = time.mktime((2021, 1, 2, 3, 4, 5, 0, 0, -1)) + 0.25
+        self.assertEqual(stamp(now), '03:04:05.250')
+        self.assertEqual(stamp(now + 0.5), '03:04:05.750')
+        self.assertEqual(stamp(now + 1), '03:04:06.250')
+
+    def test_no_digits(self):
+        stamp = TimeStamp('%Y', digits=0)
+        self.assertEqual(stamp(), time.strftime('%Y'))
+
+    def test_prefix(self):
+        DEFAULT_PRINT.stamp = TimeStamp('%H:%M:%S', digits=2)
+        try:
+            line = DEFAULT_PRINT.psfmt('text',
+                                       mark='info',
+                                       bland=True,
+                                       pad=False,
+                                       short=False,
+                                       sep='')
+            self.assertRegex(line, r'^\d\d:\d\d:\d\d\.\d\d \[INFORM\]text$')
+            index = LogIndex('unused.log', DEFAULT_PRINT)
+            self.assertEqual(index.classify(line.encode())[0], 'info')
+        finally:
+            DEFAULT_PRINT.stamp = None
+
+
+class TestLocate(unittest.TestCase):
+    def test_direct(self):
+        lineno = sys._getframe().f_lineno + 1
+        self.assertEqual(locate(), f'test_stamps.py:{lineno}:test_direct')
+
+    def test_mark(self):
+        lineno = sys._getframe().f_lineno + 1
+        line = DEFAULT_PRINT.psfmt('located',
+                                   mark='err',
+                                   locate=True,
+                                   bland=True,
+                                   pad=False,
+                                   short=False,
+                                   sep='')
+        self.assertEqual(line,
+                         f'[ERROR]test_stamps.py:{lineno}:test_mark located')
+
+    def test_inherit(self):
+        parent = InfoMark(pref='LOC', locate=True)
+        self.assertTrue(InfoMark(parent=parent, pref_color='r').locate)
+        self.assertFalse(DEFAULT_PRINT.info_style['info'].locate)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test status line
+'''
+
+import io
+import time
+import unittest
+from pathlib import Path
+
+from psprint.printer import PrintSpace
+from psprint.sinks import Sink
+from psprint.status import ERASE_LINE, StatusLine
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TTY(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestStatusLine(unittest.TestCase):
+    def test_in_place(self):
+        stream = TTY()
+        line = StatusLine(stream, rate=0)
+        line.update('1/3')
+        line.update('2/3')
+        line.close()
+        self.assertEqual(
+            stream.getvalue(),
+            '\r1/3' + ERASE_LINE + '\r2/3' + ERASE_LINE + '\n')
+
+    def test_rate(self):
+        stream = TTY()
+        line = StatusLine(stream, rate=1)
+        for item in range(1000):
+            line.update(str(item))
+        # first painted at once, newest pending
+        self.assertEqual(stream.getvalue(), '\r0' + ERASE_LINE)
+        line.flush()
+        self.assertEqual(stream.getvalue(),
+                         '\r0' + ERASE_LINE + '\r999' + ERASE_LINE)
+
+    def test_timer(self):
+        stream = TTY()
+        line = StatusLine(stream, rate=20)
+        line.update('first')
+        line.update('last')
+        time.sleep(0.2)
+        self.assertTrue(stream.getvalue().endswith('\rlast' + ERASE_LINE))
+
+    def test_above(self):
+        stream = TTY()
+        line = StatusLine(stream, rate=0)
+        line.update('busy')
+        line.above('done\n')
+        self.assertEqual(stream.getvalue(), '\rbusy' + ERASE_LINE + '\r' +
+                         ERASE_LINE + 'done\nbusy')
+
+    def test_not_tty(self):
+        stream = io.StringIO()
+        line = StatusLine(stream, rate=0)
+        line.update('1/2')
+        line.above('done\n')
+        line.update('2/2')
+        line.close()
+        self.assertEqual(stream.getvalue(), '1/2\ndone\n2/2\n')
+
+
+class TestStatus(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.switches['bland'] = True
+        self.space.status_rate = 0
+        self.stream = TTY()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_status(self):
+        self.space.status('working', mark='act')
+        self.space.psprint('found', mark='info')
+        self.space.end_status(keep=False)
+        self.space.psprint('after', mark='info')
+        self.assertEqual(
+            self.stream.getvalue(), ''.join([
+                '\r[ACTION]working', ERASE_LINE, '\r', ERASE_LINE,
+                '[INFORM]found\n[ACTION]working', '\r', ERASE_LINE,
+                '[INFORM]after\n'
+            ]))
+
+    def test_sink_above(self):
+        self.space.add_sink('term', Sink(self.stream))
+        self.space.status('working', mark='act')
+        self.space.psprint('found', mark='info')
+        self.assertEqual(
+            self.stream.getvalue(), ''.join([
+                '\r[ACTION]working', ERASE_LINE, '\r', ERASE_LINE,
+                '[INFORM]found\n[ACTION]working'
+            ]))
+        self.space.end_status()
+
+    def test_plain_above(self):
+        self.space.status('working', mark='act')
+        self.space.psprint()
+        self.space.psprint('raw', disabled=True)
+        self.space.info()
+        self.assertEqual(
+            self.stream.getvalue(), ''.join([
+                '\r[ACTION]working', ERASE_LINE, '\r', ERASE_LINE,
+                '\n[ACTION]working', '\r', ERASE_LINE, 'raw\n[ACTION]working',
+                '\r', ERASE_LINE, '\n[ACTION]working'
+            ]))
+        self.space.end_status()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test table rendering
+'''
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+from psprint.ansi import ANSI
+from psprint.printer import PrintSpace
+from psprint.width import strip_ansi, visible_width
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestWidth(unittest.TestCase):
+    def test_ascii(self):
+        self.assertEqual(visible_width('plain'), 5)
+
+    def test_ansi(self):
+        colored = ANSI.FG_COLORS['red'] + 'red' + ANSI.RESET_ALL
+        self.assertEqual(strip_ansi(colored), 'red')
+        self.assertEqual(visible_width(colored), 3)
+
+    def test_wide(self):
+        self.assertEqual(visible_width('日本'), 4)
+        self.assertEqual(visible_width('é'), 1)
+
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_sequence(self):
+        self.space.table([('a', 1), ('bbb', 22), ('日本', 333)],
+                         header=('name', 'n'),
+                         align='<>',
+                         bland=True)
+        self.assertEqual(
+            self.stream.getvalue(), '\n'.join([
+                '[LIST]name    n',
+                '[LIST]a       1',
+                '[LIST]bbb    22',
+                '[LIST]日本  333',
+                '',
+            ]))
+
+    def test_stream(self):
+        rows = ((str(num) * num, num) for num in range(1, 5))
+        self.space.table(rows, sample=2, batch=3, bland=True, short=True)
+        self.assertEqual(
+            self.stream.getvalue(), '\n'.join([
+                '[·]1   1',
+                '[·]22  2',
+                '[·]333  3',
+                '[·]4444  4',
+                '',
+            ]))
+
+    def test_styled(self):
+        self.space.table([('cell', )], pad=False, short=False)
+        mark = self.space.info_style['list']
+        self.assertEqual(
+            self.stream.getvalue(),
+            mark.pref.to_str() + str(mark.text) + 'cell' + ANSI.RESET_ALL +
+            '\n')
+
+    def test_routed(self):
+        self.space.stamp = lambda now=None: 'T'
+        self.space.edit_style(pref='ERROR', mark='err', sink='stderr')
+        errors_out = io.StringIO()
+        stderr, sys.stderr = sys.stderr, errors_out
+        try:
+            self.space.table([(1, 1), (22, 2)],
+                             mark='err',
+                             bland=True,
+                             pad=False,
+                             short=False)
+        finally:
+            sys.stderr = stderr
+        self.assertEqual(self.stream.getvalue(), '')
+        self.assertEqual(errors_out.getvalue(),
+                         'T [ERROR]1   1\nT [ERROR]22  2\n')
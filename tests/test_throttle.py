@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test flood control
+'''
+
+import io
+import unittest
+from pathlib import Path
+
+from psprint.mark_types import InfoMark
+from psprint.printer import PrintSpace
+from psprint.throttle import Collapser, TokenBucket
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst(self):
+        bucket = TokenBucket(rate=0.001, burst=3)
+        self.assertEqual([bucket.take() for _ in range(5)],
+                         [0, 0, 0, None, None])
+        self.assertEqual(bucket.dropped, 2)
+
+    def test_shared(self):
+        parent = InfoMark(pref='LIM', rate=1, burst=1)
+        child = InfoMark(parent=parent, pref_color='r')
+        self.assertIs(child.limit, parent.limit)
+
+
+class TestCollapser(unittest.TestCase):
+    def test_runs(self):
+        collapse = Collapser()
+        self.assertEqual(collapse.push('m', ('a', ), 1), (False, None))
+        self.assertEqual(collapse.push('m', ('a', ), 2), (True, None))
+        self.assertEqual(collapse.push('m', ('a', ), 3), (True, None))
+        self.assertEqual(collapse.push('m', ('b', ), 4), (False, (1, 2)))
+        self.assertEqual(collapse.push('n', ('b', ), 5), (False, None))
+        self.assertEqual(collapse.pop(), None)
+
+    def test_target(self):
+        collapse = Collapser()
+        collapse.push('m', ('a', ), 1, 'out')
+        self.assertEqual(collapse.push('m', ('a', ), 2, 'err'), (False, None))
+        self.assertEqual(collapse.push('m', ('a', ), 3, 'err'), (True, None))
+
+    def test_unhashable(self):
+        collapse = Collapser()
+        collapse.push('m', ([], ))
+        self.assertEqual(collapse.push('m', ([], )), (False, None))
+
+
+class TestFloodControl(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.out = io.StringIO()
+        self.space.print_kwargs['file'] = self.out
+        self.space.switches['bland'] = True
+
+    def test_collapse(self):
+        self.space.collapse = Collapser()
+        for _ in range(5):
+            self.space.psprint('failed', mark='err')
+        self.space.psprint('done', mark='info')
+        self.space.psprint('done', mark='err')
+        self.space.flush()
+        self.assertEqual(self.out.getvalue().splitlines(), [
+            '[ERROR]failed',
+            '[ERROR]last message repeated 4 times',
+            '[INFORM]done',
+            '[ERROR]done',
+        ])
+
+    def test_collapse_files(self):
+        self.space.collapse = Collapser()
+        other = io.StringIO()
+        self.space.psprint('failed', mark='err')
+        self.space.psprint('failed', mark='err', file=other)
+        self.space.flush()
+        self.assertEqual(self.out.getvalue(), '[ERROR]failed\n')
+        self.assertEqual(other.getvalue(), '[ERROR]failed\n')
+
+    def test_rate(self):
+        self.space.edit_style(pref='LIMIT', mark='limit', rate=0.001, burst=2)
+        for num in range(5):
+            self.space.psprint(num, mark='limit')
+        self.assertEqual(self.out.getvalue().splitlines(),
+                         ['[LIMIT]0', '[LIMIT]1'])
+        self.space.info_style['limit'].limit.rate = 1e9
+        self.space.psprint('again', mark='limit')
+        self.assertEqual(self.out.getvalue().splitlines()[2:], [
+            '[LIMIT]3 messages dropped by rate limit',
+            '[LIMIT]again',
+        ])
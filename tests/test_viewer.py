@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test indexed log viewer
+'''
+
+import io
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+from psprint import DEFAULT_PRINT, errors
+from psprint.printer import PrintSpace
+from psprint.stamps import TimeStamp
+from psprint.viewer import LogIndex, view
+
+MARKS = ('info', 'err', 'cont', 'bug')
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestViewer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = Path(self.tmpdir.name).joinpath('run.log')
+        self.write(0, 100)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, start: int, stop: int):
+        with open(self.log, 'a') as stream:
+            for num in range(start, stop):
+                DEFAULT_PRINT.psprint(f'line {num}',
+                                      mark=MARKS[num % 4],
+                                      file=stream,
+                                      bland=bool(num % 2),
+                                      pad=not num % 3,
+                                      short=not num % 5)
+
+    def test_classify(self):
+        index = LogIndex(self.log, DEFAULT_PRINT, bucket=8)
+        self.assertEqual(index.classify(b'\x1b[31m[ERROR]\x1b[0m  text')[0],
+                         'err')
+        self.assertEqual(index.classify(b'[!]text')[0], 'err')
+        self.assertIsNone(index.classify(b'text [ERROR]')[0])
+
+    def test_query(self):
+        index = LogIndex(self.log, DEFAULT_PRINT, bucket=8).update()
+        self.assertEqual(index.lines, 100)
+        hits = list(index.query(marks=['err'], from_line=50, to_line=70))
+        self.assertEqual([hit[0] for hit in hits], list(range(50, 71, 4)))
+        for lineno, _, line in hits:
+            self.assertIn(f'line {lineno - 1}'.encode(), line)
+
+    def test_incremental(self):
+        LogIndex(self.log, DEFAULT_PRINT, bucket=8).update()
+        self.write(100, 130)
+        index = LogIndex(self.log, DEFAULT_PRINT, bucket=8).update()
+        self.assertEqual(index.lines, 130)
+        fresh = LogIndex(self.log, DEFAULT_PRINT, bucket=8).update(True)
+        self.assertEqual(index.offsets, fresh.offsets)
+        self.assertEqual(index.marks, fresh.marks)
+
+    def test_replaced(self):
+        LogIndex(self.log, DEFAULT_PRINT, bucket=8).update()
+        self.log.write_text('[INFORM]replaced\n')
+        index = LogIndex(self.log, DEFAULT_PRINT, bucket=8).update()
+        self.assertEqual(index.lines, 1)
+
+    def test_view(self):
+        out = io.StringIO()
+        count = view(self.log,
+                     DEFAULT_PRINT,
+                     marks=['bug'],
+                     from_line=90,
+                     file=out,
+                     bland=True,
+                     pad=False,
+                     short=False)
+        self.assertEqual(count, 3)
+        self.assertEqual(out.getvalue().splitlines()[0], '[DEBUG]line 91')
+
+    def test_view_muted(self):
+        space = PrintSpace(config=STYLE)
+        log = Path(self.tmpdir.name).joinpath('muted.log')
+        with open(log, 'w') as stream:
+            for mark in MARKS:
+                space.psprint(f'{mark} line', mark=mark, file=stream)
+        space.edit_style(pref='DEBUG', mark='bug', mute=True)
+        out = io.StringIO()
+        count = view(log, space, marks=['bug'], file=out, bland=True)
+        self.assertEqual(count, 1)
+        self.assertIn('bug line', out.getvalue())
+
+    def test_view_stamp(self):
+        space = PrintSpace(config=STYLE)
+        space.stamp = TimeStamp('%Y-%m-%d %H:%M:%S', 0)
+        log = Path(self.tmpdir.name).joinpath('stamped.log')
+        with open(log, 'w') as stream:
+            space.psprint('stamped', mark='err', file=stream, bland=True)
+        captured = log.read_text()
+        out = io.StringIO()
+        with mock.patch('time.time', return_value=0.):
+            view(log, space, file=out, bland=True)
+        self.assertEqual(out.getvalue(), captured)
+
+    def test_unsaved_index(self):
+        self.log.with_name(self.log.name + '.psidx').mkdir()
+        out = io.StringIO()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            count = view(self.log, DEFAULT_PRINT, marks=['bug'], file=out)
+        self.assertEqual(caught[0].category, errors.PSPrintWarning)
+        self.assertEqual(count, 25)
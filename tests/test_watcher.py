@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test reloading of styles
+'''
+
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+import warnings
+from pathlib import Path
+
+from psprint import errors
+from psprint.printer import PrintSpace
+from psprint.watcher import Watcher
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name).joinpath('style.yml')
+        self.changed = threading.Event()
+        self.watcher = Watcher(lambda: [self.path],
+                               self.changed.set,
+                               interval=0.02)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_created(self):
+        self.watcher.start()
+        time.sleep(0.05)
+        self.assertFalse(self.changed.is_set())
+        self.path.write_text('{}\n')
+        self.assertTrue(self.changed.wait(2))
+
+    def test_failing_callback(self):
+        calls = []
+
+        def callback():
+            calls.append(None)
+            if len(calls) == 1:
+                raise AttributeError('broken')
+            self.changed.set()
+
+        self.watcher.callback = callback
+        self.watcher.interval = 60
+        self.watcher.start()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.watcher.poke()
+            deadline = time.monotonic() + 2
+            while not calls:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            time.sleep(0.05)
+        self.assertEqual(caught[0].category, errors.PSPrintWarning)
+        self.watcher.poke()
+        self.assertTrue(self.changed.wait(2))
+
+    def test_poke(self):
+        self.watcher.interval = 60
+        self.watcher.start()
+        self.watcher.poke()
+        self.assertTrue(self.changed.wait(2))
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = Path(self.tmpdir.name).joinpath('style.yml')
+        self.config.write_text('\n'.join([
+            'FLAGS:',
+            '  pad: false',
+            'site:',
+            '  pref: SITE',
+            '',
+        ]))
+        self.space = PrintSpace(config=STYLE)
+        self.space.set_opts(self.config)
+        self.space.switches['bland'] = True
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def tearDown(self):
+        self.space.unwatch()
+        self.tmpdir.cleanup()
+
+    def rewrite(self, text):
+        self.config.write_text(text)
+        # coarse file systems: make sure the modification is seen
+        stat = os.stat(self.config)
+        os.utime(self.config, ns=(stat.st_atime_ns,
+                                  stat.st_mtime_ns + 10**9))
+
+    def test_reload(self):
+        old_style = self.space.info_style
+        self.rewrite('new:\n  pref: NEW\n')
+        self.space.reload()
+        self.assertIsNot(self.space.info_style, old_style)
+        self.assertNotIn('site', self.space.info_style)
+        self.assertFalse(hasattr(self.space, 'site'))
+        self.space.new('fresh')
+        self.assertEqual(self.stream.getvalue(), '[NEW]fresh\n')
+        # switches are left alone
+        self.assertTrue(self.space.switches['bland'])
+
+    def test_watch(self):
+        self.space.watch(interval=0.02, sighup=False)
+        self.rewrite('site:\n  pref: RENAMED\nmore:\n  pref: MORE\n')
+        deadline = time.monotonic() + 2
+        while 'more' not in self.space.info_style:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.space.site('renamed')
+        self.assertEqual(self.stream.getvalue(), '[RENAMED]renamed\n')
+
+    def test_broken(self):
+        old_style = self.space.info_style
+        self.rewrite('site:\n  text_color: r\n')
+        self.assertRaises(errors.BadMark, self.space.reload)
+        self.assertIs(self.space.info_style, old_style)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.space._reload_quietly()
+        self.assertEqual(caught[0].category, errors.ValueWarning)
+
+    def test_truncated(self):
+        self.space.watch(interval=0.02, sighup=False)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.rewrite('')
+            time.sleep(0.2)
+        self.assertTrue(caught)
+        self.assertIn('site', self.space.info_style)
+        self.rewrite('site:\n  pref: SITE\nmore:\n  pref: MORE\n')
+        deadline = time.monotonic() + 2
+        while 'more' not in self.space.info_style:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_named_route(self):
+        log = Path(self.tmpdir.name).joinpath('run.log')
+        self.rewrite('\n'.join([
+            'sinks:',
+            '  log:',
+            '    kind: file',
+            f'    file: {log}',
+            'site:',
+            '  pref: SITE',
+            '  sink: log',
+            '',
+        ]))
+        space = PrintSpace(config=self.config)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            space.reload()
+        self.assertEqual(caught, [])
+        space.site('logged')
+        space.sinks['log'].close()
+        self.assertIn('logged', log.read_text())
+
+    def test_empty(self):
+        self.rewrite('')
+        self.assertRaises(errors.BadMark, self.space.reload)
+
+    def test_consistent(self):
+        done = threading.Event()
+
+        def reload():
+            while not done.is_set():
+                self.space.reload()
+
+        thread = threading.Thread(target=reload)
+        thread.start()
+        try:
+            for _ in range(500):
+                self.space.psprint('x', mark=len(self.space.info_index) - 1)
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(self.stream.getvalue().count('\n'), 500)
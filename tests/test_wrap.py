@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8; mode:python -*-
+#
+# Copyright 2020, 2021 Pradyumna Paranjape
+# This file is part of psprint.
+#
+# psprint is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# psprint is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with psprint.  If not, see <https://www.gnu.org/licenses/>.
+#
+'''
+test wrapping
+'''
+
+import io
+import unittest
+from pathlib import Path
+
+from psprint.ansi import ANSI
+from psprint.printer import PrintSpace
+from psprint.width import terminal_width, wrap
+
+STYLE = Path(__file__).parent.parent.joinpath('psprint', 'style.yml')
+
+
+class TestWrap(unittest.TestCase):
+    def test_words(self):
+        self.assertEqual(
+            wrap('the quick brown fox jumps over the lazy dog', 4, 20),
+            'the quick brown\n    fox jumps over\n    the lazy dog')
+
+    def test_long_word(self):
+        self.assertEqual(wrap('x' * 25, 2, 12),
+                         '\n  '.join(('x' * 10, 'x' * 10, 'x' * 5)))
+
+    def test_wide(self):
+        self.assertEqual(wrap('日本語日本語', 2, 8), '日本語\n  日本語')
+
+    def test_escapes(self):
+        red = ANSI.FG_COLORS['r']
+        self.assertEqual(wrap(red + 'abc def' + ANSI.RESET_ALL, 0, 4),
+                         red + 'abc\ndef' + ANSI.RESET_ALL)
+
+    def test_newline(self):
+        self.assertEqual(wrap('one\ntwo', 3, 80), 'one\n   two')
+
+    def test_terminal(self):
+        self.assertGreater(terminal_width(), 0)
+        self.assertEqual(terminal_width(), terminal_width())
+
+
+class TestWrapSwitch(unittest.TestCase):
+    def setUp(self):
+        self.space = PrintSpace(config=STYLE)
+        self.space.wrap_width = 20
+        self.stream = io.StringIO()
+        self.space.print_kwargs['file'] = self.stream
+
+    def test_hanging(self):
+        self.space.psprint('one two three four',
+                           mark='info',
+                           wrap=True,
+                           bland=True,
+                           pad=True)
+        self.assertEqual(self.stream.getvalue(),
+                         '[INFORM]  one two\n          three four\n')
+
+    def test_off(self):
+        self.space.psprint('one two three four', mark='info', bland=True)
+        self.assertEqual(self.stream.getvalue(),
+                         '[INFORM]one two three four\n')
+
+    def test_list_form(self):
+        text = self.space.psfmt('one two',
+                                'three four',
+                                mark='info',
+                                wrap=True,
+                                bland=True,
+                                pad=True)
+        self.assertEqual(text, ['[INFORM]  one two\n          three four'])